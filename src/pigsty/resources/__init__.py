@@ -1,4 +1,14 @@
 __all__ = [
+    "archive",
+    "arf",
+    "benchmark",
+    "cache",
     "checklist",
+    "delta",
+    "filters",
+    "fleet",
     "openscap",
+    "oval",
+    "sources",
+    "table",
 ]
@@ -0,0 +1,242 @@
+"""
+Access to STIG and SCAP bundles inside ZIP archives, including nested ZIPs.
+"""
+
+import fnmatch
+import io
+import zipfile
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+
+NESTED_CACHE_SIZE: int = 4
+
+
+@lru_cache(maxsize=NESTED_CACHE_SIZE)
+def _nested_archive(archive: Path, signature: tuple, parents: tuple) -> bytes:
+    """
+    Read a nested archive into memory. The most recently used nested
+    archives are kept, keyed on the outer archive's size and modification
+    time, so repeated reads of members of the same bundle do not decompress
+    it again.
+    """
+    data = None
+    for parent in parents:
+        with zipfile.ZipFile(archive if data is None else io.BytesIO(data)) as zf:
+            data = zf.read(parent)
+    return data
+
+
+class ArchiveMember:
+    """
+    A file inside a ZIP archive, possibly inside nested ZIPs, that can be
+    passed to the resource loaders in place of a path. Members are read
+    straight from the archive; nothing is extracted to disk.
+
+    Args:
+        archive (str): Path to the outer ZIP file
+        member (str): Name of the member in its innermost archive
+        parents (tuple[str]): Names of the nested ZIPs holding the member,
+            outermost first
+        size (int): Uncompressed size of the member in bytes
+
+    Attributes:
+        archive (Path): Path to the outer ZIP file
+        member (str): Name of the member in its innermost archive
+        parents (tuple[str]): Names of the nested ZIPs holding the member
+        size (int): Uncompressed size of the member in bytes
+
+    Properties:
+        name (str): Final component of the member name
+        suffix (str): File extension of the member name
+    """
+
+    def __init__(
+        self, archive: str, member: str, parents: tuple = (), size: int = None
+    ):
+        self.archive: Path = Path(archive)
+        self.member: str = member
+        self.parents: tuple[str] = tuple(parents)
+        self.size: int = size
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.member).suffix
+
+    def open(self, mode: str = "rb"):
+        """
+        Open the member for reading.
+
+        Args:
+            mode (str): Must be 'rb'
+
+        Returns:
+            zipfile.ZipExtFile: Seekable binary file object
+
+        Raises:
+            FileNotFoundError: If the member is not in the archive
+        """
+        if mode != "rb":
+            raise ValueError(f"Archive members can only be opened 'rb', not {mode}")
+        if self.parents:
+            source = io.BytesIO(
+                _nested_archive(self.archive, _signature(self.archive), self.parents)
+            )
+        else:
+            source = self.archive
+        zf = zipfile.ZipFile(source)
+        try:
+            return zf.open(self.member)
+        except KeyError as exc:
+            raise FileNotFoundError(f"{self} not found") from exc
+        finally:
+            zf.close()
+
+    def read_bytes(self) -> bytes:
+        """
+        Return the content of the member.
+        """
+        with self.open() as fh:
+            return fh.read()
+
+    def stat(self):
+        """
+        Return the stat result of the outer archive, which changes whenever
+        the member can have changed.
+        """
+        return self.archive.stat()
+
+    def resolve(self) -> "ArchiveMember":
+        """
+        Return the member with an absolute archive path.
+        """
+        return ArchiveMember(
+            self.archive.resolve(), self.member, self.parents, self.size
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArchiveMember):
+            return NotImplemented
+        return (self.archive, self.parents, self.member) == (
+            other.archive,
+            other.parents,
+            other.member,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.archive, self.parents, self.member))
+
+    def __str__(self) -> str:
+        return "/".join((str(self.archive),) + self.parents + (self.member,))
+
+    def __repr__(self) -> str:
+        return f"ArchiveMember({str(self)!r})"
+
+
+class ArchiveIndex:
+    """
+    Index of the members of a ZIP archive and the ZIPs nested in it.
+
+    Only the central directories are read for the outer archive; each nested
+    ZIP is read into memory once while indexing so its directory can be
+    listed.
+
+    Args:
+        file (str): Path to ZIP file
+        nested (bool): Whether to index the members of nested ZIPs
+        autoload (bool): Whether to index the archive immediately
+
+    Attributes:
+        file (Path): Path to ZIP file
+        members (dict[str, ArchiveMember]): Members by path, with the names of
+            nested ZIPs as leading path components
+
+    Methods:
+        load(self): Index the archive
+        find(self, pattern) -> list[ArchiveMember]: Members matching a glob
+        xccdf(self) -> list[ArchiveMember]: XCCDF benchmark and result members
+        checklists(self) -> list[ArchiveMember]: CKL members
+    """
+
+    def __init__(self, file: str, nested: bool = True, autoload: bool = True):
+        self.file: Path = Path(file)
+        self.nested: bool = nested
+        self.members: dict[str, ArchiveMember] = {}
+        if autoload:
+            self.load()
+
+    def load(self):
+        """
+        Index the archive.
+
+        Raises:
+            zipfile.BadZipFile: If the file or a nested ZIP is not a ZIP file
+        """
+        self.members = {}
+        self._index(self.file, ())
+
+    def _index(self, source, parents: tuple):
+        """
+        Add the members of an archive, recursing into nested ZIPs.
+        """
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                member = ArchiveMember(
+                    self.file, info.filename, parents, info.file_size
+                )
+                self.members["/".join(parents + (info.filename,))] = member
+                if self.nested and info.filename.lower().endswith(".zip"):
+                    self._index(io.BytesIO(zf.read(info)), parents + (info.filename,))
+
+    def find(self, pattern: str) -> list[ArchiveMember]:
+        """
+        Return members whose path or name matches a glob pattern,
+        case-insensitively.
+
+        Args:
+            pattern (str): Glob pattern, e.g. '*Manual-xccdf.xml'
+
+        Returns:
+            list[ArchiveMember]: Matching members
+        """
+        pattern = pattern.lower()
+        return [
+            member
+            for path, member in self.members.items()
+            if fnmatch.fnmatchcase(path.lower(), pattern)
+            or fnmatch.fnmatchcase(member.name.lower(), pattern)
+        ]
+
+    def xccdf(self) -> list[ArchiveMember]:
+        """
+        Return the XCCDF members.
+        """
+        return self.find("*xccdf*.xml")
+
+    def checklists(self) -> list[ArchiveMember]:
+        """
+        Return the checklist members.
+        """
+        return self.find("*.ckl")
+
+    def __getitem__(self, path: str) -> ArchiveMember:
+        return self.members[path]
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+
+def _signature(file: Path) -> tuple:
+    """
+    Size and modification time of a file.
+    """
+    stat_result = file.stat()
+    return (stat_result.st_size, stat_result.st_mtime_ns)
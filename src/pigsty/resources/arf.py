@@ -0,0 +1,236 @@
+"""
+Interface to SCAP Asset Reporting Format (ARF) result collections.
+"""
+
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+
+from .openscap import NS, OpenSCAPSTIGViewerResult
+from .oval import OVALResults
+from .sources import open_source, parse_error, source_path
+
+TEST_RESULT: str = f"{{{NS['xccdf']}}}TestResult"
+OVAL_RESULTS: str = f"{{{NS['XMLSchema']}}}oval_results"
+SYSTEM_CHARACTERISTICS: str = f"{{{NS['oval-characteristics']}}}oval_system_characteristics"
+
+SECTION_TAGS: dict = {
+    f"{{{NS['arf']}}}report-request": "report_requests",
+    f"{{{NS['arf']}}}asset": "assets",
+    f"{{{NS['arf']}}}report": "reports",
+}
+
+CONTENT_TAGS: set = {
+    TEST_RESULT,
+    OVAL_RESULTS,
+    SYSTEM_CHARACTERISTICS,
+}
+
+
+class ARFSection:
+    """
+    Location of an indexed element in an ARF file.
+
+    Args:
+        tag (str): Element tag in '{namespace}name' form
+        id (str): Value of the id attribute
+        start (int): Byte offset of the start tag
+        namespaces (dict[str, str]): Namespace declarations in scope
+        report (str): id of the enclosing report-request, asset or report
+
+    Attributes:
+        end (int): Byte offset of the end tag
+    """
+
+    __slots__ = ("tag", "id", "start", "end", "namespaces", "report")
+
+    def __init__(
+        self, tag: str, id: str, start: int, namespaces: dict, report: str = None
+    ):
+        self.tag: str = tag
+        self.id: str = id
+        self.start: int = start
+        self.end: int = None
+        self.namespaces: dict[str, str] = namespaces
+        self.report: str = report
+
+    def __repr__(self) -> str:
+        return f"ARFSection({self.tag!r}, id={self.id!r})"
+
+
+class AssetReportCollection:
+    """
+    Interface to an ARF asset report collection with lazy section access.
+
+    The file is indexed in a single expat pass that records the byte range
+    of every report-request, asset and report, and of the XCCDF TestResult,
+    OVAL results and OVAL system characteristics they contain. No elements
+    are built while indexing; each section is parsed from its byte range
+    only when it is first accessed, so the OVAL payload is never parsed
+    unless it is asked for.
+
+    Args:
+        file (str): Path to ARF file
+        autoload (bool): Whether to index the file immediately
+
+    Attributes:
+        file (Path): Path to ARF file
+        report_requests (dict[str, ARFSection]): Report requests by id
+        assets (dict[str, ARFSection]): Assets by id
+        reports (dict[str, ARFSection]): Reports by id
+        contents (dict[str, list[ARFSection]]): XCCDF and OVAL sections by tag
+
+    Properties:
+        xccdf_result (OpenSCAPSTIGViewerResult): First XCCDF TestResult
+        oval_results (OVALResults): First OVAL results
+        system_characteristics (ET.Element): First OVAL system characteristics
+    """
+
+    def __init__(self, file: str, autoload: bool = True):
+        self.file: Path = source_path(file)
+        self.report_requests: dict[str, ARFSection] = {}
+        self.assets: dict[str, ARFSection] = {}
+        self.reports: dict[str, ARFSection] = {}
+        self.contents: dict[str, list[ARFSection]] = {}
+        self._loaded: dict[str, object] = {}
+        if autoload:
+            self.load()
+
+    def load(self):
+        """
+        Index the sections of the ARF file.
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        self.report_requests = {}
+        self.assets = {}
+        self.reports = {}
+        self.contents = {}
+        self._loaded = {}
+        try:
+            self._index()
+        except expat.ExpatError as exc:
+            raise parse_error(exc) from exc
+
+    def _index(self):
+        """
+        Record the byte range and namespace scope of each section.
+        """
+        parser = expat.ParserCreate(namespace_separator=" ")
+        scopes: dict[str, list[str]] = {}
+        open_sections: list[tuple[int, ARFSection]] = []
+        depth = 0
+        report: str = None
+
+        def start_namespace(prefix: str, uri: str):
+            scopes.setdefault(prefix or "", []).append(uri)
+
+        def end_namespace(prefix: str):
+            scopes[prefix or ""].pop()
+
+        def start_element(name: str, attrs: dict):
+            nonlocal depth, report
+            depth += 1
+            tag = _clark(name)
+            if tag in SECTION_TAGS or tag in CONTENT_TAGS:
+                namespaces = {x: y[-1] for x, y in scopes.items() if y}
+                section = ARFSection(
+                    tag, attrs.get("id"), parser.CurrentByteIndex, namespaces, report
+                )
+                if tag in SECTION_TAGS:
+                    report = section.id
+                open_sections.append((depth, section))
+
+        def end_element(name: str):
+            nonlocal depth, report
+            if open_sections and open_sections[-1][0] == depth:
+                section = open_sections.pop()[1]
+                section.end = parser.CurrentByteIndex
+                if section.tag in SECTION_TAGS:
+                    getattr(self, SECTION_TAGS[section.tag])[section.id] = section
+                    report = None
+                else:
+                    self.contents.setdefault(section.tag, []).append(section)
+            depth -= 1
+
+        parser.StartNamespaceDeclHandler = start_namespace
+        parser.EndNamespaceDeclHandler = end_namespace
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        with open_source(self.file) as fh:
+            parser.ParseFile(fh)
+
+    def element(self, section: ARFSection) -> ET.Element:
+        """
+        Parse a section from its byte range in the file.
+
+        Args:
+            section (ARFSection): Indexed section
+
+        Returns:
+            ET.Element: Section element
+        """
+        with open_source(self.file) as fh:
+            fh.seek(section.start)
+            data = fh.read(section.end - section.start)
+            end_tag = b""
+            while not end_tag.endswith(b">"):
+                chunk = fh.read(256)
+                if not chunk:
+                    break
+                index = chunk.find(b">")
+                end_tag += chunk if index == -1 else chunk[: index + 1]
+        declarations = " ".join(
+            f"xmlns:{prefix}={quoteattr(uri)}" if prefix else f"xmlns={quoteattr(uri)}"
+            for prefix, uri in section.namespaces.items()
+        )
+        wrapper = ET.fromstring(
+            f"<arf-section {declarations}>".encode()
+            + data
+            + end_tag
+            + b"</arf-section>"
+        )
+        return wrapper[0]
+
+    def _first(self, tag: str) -> ET.Element:
+        """
+        Parse and cache the first section with a tag.
+        """
+        if tag not in self._loaded:
+            sections = self.contents.get(tag)
+            self._loaded[tag] = self.element(sections[0]) if sections else None
+        return self._loaded[tag]
+
+    @property
+    def xccdf_result(self) -> OpenSCAPSTIGViewerResult:
+        if "xccdf_result" not in self._loaded:
+            root = self._first(TEST_RESULT)
+            self._loaded["xccdf_result"] = (
+                None
+                if root is None
+                else OpenSCAPSTIGViewerResult.from_element(root, self.file)
+            )
+        return self._loaded["xccdf_result"]
+
+    @property
+    def oval_results(self) -> OVALResults:
+        if "oval_results" not in self._loaded:
+            root = self._first(OVAL_RESULTS)
+            self._loaded["oval_results"] = (
+                None if root is None else OVALResults.from_element(root, self.file)
+            )
+        return self._loaded["oval_results"]
+
+    @property
+    def system_characteristics(self) -> ET.Element:
+        return self._first(SYSTEM_CHARACTERISTICS)
+
+
+def _clark(name: str) -> str:
+    """
+    Convert an expat 'namespace name' pair to '{namespace}name' form.
+    """
+    namespace, _, local = name.rpartition(" ")
+    return f"{{{namespace}}}{local}" if namespace else local
@@ -0,0 +1,458 @@
+"""
+Interface to DISA STIG XCCDF benchmarks
+"""
+
+import re
+from pathlib import Path
+from xml.parsers import expat
+
+from .openscap import VID_REGEX
+from .sources import (
+    BUFFER_TYPES,
+    open_source,
+    parse_error,
+    source_compression,
+    source_path,
+)
+
+READ_CHUNK_SIZE: int = 2**16
+
+IN_PLACE_TYPES: tuple = (Path,) + BUFFER_TYPES
+
+RULE_ID_REGEX: re.Pattern = re.compile(r"SV-[0-9]+r[0-9]+_rule")
+
+TEXT_FIELDS: tuple = ("description", "check_content", "fixtext")
+
+TEXT_TAGS: dict = {
+    ("Rule", "description"): "description",
+    ("check", "check-content"): "check_content",
+    ("Rule", "fixtext"): "fixtext",
+}
+
+BENCHMARK_FIELDS: dict = {
+    ("Benchmark", "title"): "title",
+    ("Benchmark", "version"): "version",
+    ("Benchmark", "status"): "status",
+}
+
+RULE_FIELDS: dict = {
+    ("Group", "title"): "group_title",
+    ("Rule", "title"): "title",
+    ("Rule", "version"): "stig_id",
+    ("Rule", "ident"): "ident",
+}
+
+
+class BenchmarkRule:
+    """
+    Compact benchmark rule holding short values in slots. The description,
+    check content and fix text are not held in memory; they are read from
+    their byte range in the benchmark file when accessed.
+
+    Args:
+        vid (str): V-ID in format 'V-[0-9]+'
+        rule_id (str): Rule ID
+        stig_id (str): STIG ID (the rule version)
+        group_title (str): Group title, usually the SRG ID
+        title (str): Rule title
+        severity (str): Severity rating
+        weight (str): Numeric weight of check
+        legacy_ids (tuple[str]): Legacy V-IDs and rule IDs
+        ccis (tuple[str]): CCI references
+        benchmark (DISABenchmark): Benchmark the rule was read from
+        spans (tuple[tuple[int, int]]): Byte ranges of the text fields
+
+    Properties:
+        description (str): Rule description
+        check_content (str): Check content
+        fixtext (str): Fix text
+    """
+
+    __slots__ = (
+        "vid",
+        "rule_id",
+        "stig_id",
+        "group_title",
+        "title",
+        "severity",
+        "weight",
+        "legacy_ids",
+        "ccis",
+        "benchmark",
+        "spans",
+    )
+
+    def __init__(
+        self,
+        vid: str,
+        rule_id: str,
+        stig_id: str = None,
+        group_title: str = None,
+        title: str = None,
+        severity: str = None,
+        weight: str = None,
+        legacy_ids: tuple = (),
+        ccis: tuple = (),
+        benchmark: "DISABenchmark" = None,
+        spans: tuple = ((0, 0), (0, 0), (0, 0)),
+    ):
+        self.vid: str = vid
+        self.rule_id: str = rule_id
+        self.stig_id: str = stig_id
+        self.group_title: str = group_title
+        self.title: str = title
+        self.severity: str = severity
+        self.weight: str = weight
+        self.legacy_ids: tuple[str] = legacy_ids
+        self.ccis: tuple[str] = ccis
+        self.benchmark: DISABenchmark = benchmark
+        self.spans: tuple[tuple[int, int]] = spans
+
+    @property
+    def description(self) -> str:
+        return self.benchmark.text(self, "description")
+
+    @property
+    def check_content(self) -> str:
+        return self.benchmark.text(self, "check_content")
+
+    @property
+    def fixtext(self) -> str:
+        return self.benchmark.text(self, "fixtext")
+
+    def as_dict(self, text: bool = False) -> dict:
+        """
+        Returns a dictionary representation of the BenchmarkRule object
+
+        Args:
+            text (bool): Whether to read and include the long text fields
+        """
+        data = {
+            x: getattr(self, x)
+            for x in self.__slots__
+            if x not in ("benchmark", "spans")
+        }
+        if text:
+            # Read in file order so compressed benchmarks are not reopened
+            order = sorted(range(len(TEXT_FIELDS)), key=self.spans.__getitem__)
+            texts = {TEXT_FIELDS[x]: getattr(self, TEXT_FIELDS[x]) for x in order}
+            data.update({x: texts[x] for x in TEXT_FIELDS})
+        return data
+
+    def __repr__(self) -> str:
+        return f"BenchmarkRule({self.vid!r}, rule_id={self.rule_id!r})"
+
+
+class DISABenchmark:
+    """
+    Interface to a DISA STIG XCCDF benchmark, in XCCDF 1.1 or 1.2, with
+    indexes from V-ID, rule ID, STIG ID, legacy ID and CCI to compact rule
+    records.
+
+    The file is read with a streaming parser that records the byte range of
+    each rule's long text fields instead of keeping the text, so a loaded
+    benchmark holds only the short values and indexes in memory. Text is
+    read in place from uncompressed files and buffers. Other sources, such
+    as gzip files and archive members, cannot seek without decompressing
+    from the start; they are read forward through one open reader, which
+    is reopened only to move backwards, so text read in document order
+    decompresses the file once without keeping it in memory. Call close()
+    to release the reader.
+
+    Args:
+        file (str): Path to benchmark XCCDF file
+        autoload (bool): Whether to load the data immediately
+
+    Attributes:
+        file (Path): Path to benchmark XCCDF file
+        id (str): Benchmark id
+        title (str): Benchmark title
+        version (str): Benchmark version
+        status (str): Benchmark status
+        release_info (str): Release and benchmark date
+        encoding (str): Document encoding
+        rules (dict[str, BenchmarkRule]): Rules by V-ID
+        rule_ids (dict[str, BenchmarkRule]): Rules by full and short rule ID
+        stig_ids (dict[str, BenchmarkRule]): Rules by STIG ID
+        legacy_ids (dict[str, list[BenchmarkRule]]): Rules by legacy ID
+        ccis (dict[str, list[BenchmarkRule]]): Rules by CCI
+
+    Methods:
+        load(self): Load and index the benchmark
+        iter_rules(self): Stream rule records from the file
+        rule(self, identifier) -> BenchmarkRule: Rule by V-ID, rule ID or STIG ID
+        find(self, identifier) -> list[BenchmarkRule]: Rules matching any ID
+        text(self, rule, field) -> str: Read a long text field of a rule
+        close(self): Close the reader kept open for text reads
+    """
+
+    def __init__(self, file: str, autoload: bool = True):
+        self.file: Path = source_path(file)
+        self.id: str = None
+        self.title: str = None
+        self.version: str = None
+        self.status: str = None
+        self.release_info: str = None
+        self.encoding: str = "utf-8"
+        self._in_place: bool = None
+        self._reader = None
+        self._position: int = 0
+        self._reset()
+        if autoload:
+            self.load()
+
+    def _reset(self):
+        self.rules: dict[str, BenchmarkRule] = {}
+        self.rule_ids: dict[str, BenchmarkRule] = {}
+        self.stig_ids: dict[str, BenchmarkRule] = {}
+        self.legacy_ids: dict[str, list[BenchmarkRule]] = {}
+        self.ccis: dict[str, list[BenchmarkRule]] = {}
+
+    def load(self):
+        """
+        Load and index the benchmark.
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        self._reset()
+        self.close()
+        self._in_place = None
+        for rule in self.iter_rules():
+            self.rules[rule.vid] = rule
+            self.rule_ids[rule.rule_id] = rule
+            short_id = RULE_ID_REGEX.search(rule.rule_id)
+            if short_id:
+                self.rule_ids.setdefault(short_id.group(0), rule)
+            if rule.stig_id:
+                self.stig_ids[rule.stig_id] = rule
+            for legacy_id in rule.legacy_ids:
+                self.legacy_ids.setdefault(legacy_id, []).append(rule)
+            for cci in rule.ccis:
+                self.ccis.setdefault(cci, []).append(rule)
+
+    def iter_rules(self):
+        """
+        Stream rule records from the file. Benchmark metadata is set as it is
+        passed. The indexes are not populated.
+
+        Yields:
+            BenchmarkRule: Rule record
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        parser = expat.ParserCreate(namespace_separator=" ")
+        stack: list[str] = []
+        rules: list[BenchmarkRule] = []
+        group: dict = {}
+        rule: dict = None
+        field: str = None
+        texts: list[str] = []
+        ident_system: str = None
+        span: list = None
+
+        def xml_declaration(version: str, encoding: str, standalone: int):
+            if encoding:
+                self.encoding = encoding
+
+        def start_element(name: str, attrs: dict):
+            nonlocal group, rule, field, texts, ident_system, span
+            local = name.rpartition(" ")[2]
+            parent = stack[-1] if stack else None
+            stack.append(local)
+            if span is not None and span[1] is None:
+                span[1] = parser.CurrentByteIndex
+            key = (parent, local)
+            if not parent:
+                self.id = attrs.get("id")
+            elif local == "Group":
+                group = {"id": attrs.get("id")}
+            elif local == "Rule":
+                rule = {
+                    "rule_id": attrs.get("id"),
+                    "severity": attrs.get("severity"),
+                    "weight": attrs.get("weight"),
+                    "legacy_ids": [],
+                    "ccis": [],
+                    "spans": {},
+                }
+            elif rule is not None and key in TEXT_TAGS:
+                span = [TEXT_TAGS[key], None, len(stack)]
+            elif key in RULE_FIELDS or key in BENCHMARK_FIELDS:
+                field = RULE_FIELDS.get(key) or BENCHMARK_FIELDS[key]
+                ident_system = attrs.get("system", "")
+                texts = []
+            elif key == ("Benchmark", "plain-text"):
+                if attrs.get("id") == "release-info":
+                    field = "release_info"
+                    texts = []
+
+        def character_data(data: str):
+            if field is not None:
+                texts.append(data)
+            if span is not None and span[1] is None:
+                span[1] = parser.CurrentByteIndex
+
+        def start_cdata():
+            if span is not None and span[1] is None:
+                span[1] = parser.CurrentByteIndex
+
+        def end_element(name: str):
+            nonlocal group, rule, field, span
+            local = stack.pop()
+            if span is not None and len(stack) + 1 == span[2]:
+                end = parser.CurrentByteIndex
+                rule["spans"][span[0]] = (end if span[1] is None else span[1], end)
+                span = None
+            elif field is not None:
+                value = "".join(texts)
+                if field == "ident":
+                    if value.startswith("CCI-"):
+                        rule["ccis"].append(value)
+                    elif ident_system.endswith("/legacy"):
+                        rule["legacy_ids"].append(value)
+                elif field == "group_title":
+                    group["title"] = value
+                elif rule is not None:
+                    rule[field] = value
+                else:
+                    setattr(self, field, value)
+                field = None
+            elif local == "Rule":
+                rules.append(self._record(group, rule))
+                rule = None
+            elif local == "Group":
+                group = {}
+
+        parser.XmlDeclHandler = xml_declaration
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        parser.StartCdataSectionHandler = start_cdata
+        with open_source(self.file) as fh:
+            while True:
+                chunk = fh.read(READ_CHUNK_SIZE)
+                try:
+                    parser.Parse(chunk, not chunk)
+                except expat.ExpatError as exc:
+                    raise parse_error(exc) from exc
+                yield from rules
+                rules.clear()
+                if not chunk:
+                    break
+
+    def _record(self, group: dict, rule: dict) -> BenchmarkRule:
+        """
+        Build a rule record from the values collected for a Group and Rule.
+        """
+        vid = VID_REGEX.search(group.get("id") or "") or VID_REGEX.search(
+            rule["rule_id"] or ""
+        )
+        spans = rule["spans"]
+        return BenchmarkRule(
+            vid=vid.group(0) if vid else group.get("id"),
+            rule_id=rule["rule_id"],
+            stig_id=rule.get("stig_id"),
+            group_title=group.get("title"),
+            title=rule.get("title"),
+            severity=rule["severity"],
+            weight=rule["weight"],
+            legacy_ids=tuple(rule["legacy_ids"]),
+            ccis=tuple(rule["ccis"]),
+            benchmark=self,
+            spans=tuple(spans.get(x, (0, 0)) for x in TEXT_FIELDS),
+        )
+
+    def rule(self, identifier: str) -> BenchmarkRule:
+        """
+        Return the rule with a V-ID, rule ID or STIG ID.
+
+        Args:
+            identifier (str): V-ID, full or short rule ID, or STIG ID
+
+        Returns:
+            BenchmarkRule: Rule record, or None if not found
+        """
+        return (
+            self.rules.get(identifier)
+            or self.rule_ids.get(identifier)
+            or self.stig_ids.get(identifier)
+        )
+
+    def find(self, identifier: str) -> list[BenchmarkRule]:
+        """
+        Return all rules matching a V-ID, rule ID, STIG ID, legacy ID or CCI.
+
+        Args:
+            identifier (str): Identifier
+
+        Returns:
+            list[BenchmarkRule]: Matching rules
+        """
+        rule = self.rule(identifier)
+        if rule is not None:
+            return [rule]
+        return list(self.legacy_ids.get(identifier) or self.ccis.get(identifier, []))
+
+    def text(self, rule: BenchmarkRule, field: str) -> str:
+        """
+        Read a long text field of a rule from the benchmark file.
+
+        Args:
+            rule (BenchmarkRule): Rule record
+            field (str): One of 'description', 'check_content' or 'fixtext'
+
+        Returns:
+            str: Field text, or an empty string if the rule has no such field
+        """
+        start, end = rule.spans[TEXT_FIELDS.index(field)]
+        if start == end:
+            return ""
+        data = self._read(start, end)
+        texts: list[str] = []
+        parser = expat.ParserCreate(self.encoding)
+        parser.CharacterDataHandler = texts.append
+        parser.Parse(b"<text>" + data + b"</text>", True)
+        return "".join(texts)
+
+    def _read(self, start: int, end: int) -> bytes:
+        """
+        Read a byte range of the decompressed benchmark.
+        """
+        if self._in_place is None:
+            self._in_place = (
+                isinstance(self.file, IN_PLACE_TYPES)
+                and source_compression(self.file) is None
+            )
+        if self._in_place:
+            with open_source(self.file) as fh:
+                fh.seek(start)
+                return fh.read(end - start)
+        if self._reader is None or self._position > start:
+            self.close()
+            self._reader = open_source(self.file)
+        while self._position < start:
+            skipped = self._reader.read(min(READ_CHUNK_SIZE, start - self._position))
+            if not skipped:
+                break
+            self._position += len(skipped)
+        data = self._reader.read(end - start)
+        self._position += len(data)
+        return data
+
+    def close(self):
+        """
+        Close the reader kept open for text reads of a compressed or archived
+        benchmark. It is reopened by the next text read.
+        """
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._position = 0
+
+    def __enter__(self) -> "DISABenchmark":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
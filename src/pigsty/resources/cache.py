@@ -0,0 +1,212 @@
+"""
+Persistent on-disk cache of parsed checklist and OpenSCAP result data.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+
+from .archive import ArchiveMember
+from .checklist import Checklist
+from .openscap import OpenSCAPSTIGViewerResult
+from .sources import atomic_write, open_source, source_path
+
+CACHE_VERSION: int = 1
+
+CACHEABLE_TYPES: tuple = (Path, ArchiveMember)
+
+
+class ParseCache:
+    """
+    Opt-in cache of compact document summaries, stored on disk.
+
+    Entries are keyed by document type and resolved path, and are only used
+    while the file size, modification time and, optionally, a SHA-256 hash of
+    the content still match. The least recently used entries are evicted
+    once the cache grows past max_size bytes. Entry sizes and recency are
+    read from the directory once, on the first store, and tracked in memory
+    from then on, so entries written by other processes are only counted by
+    caches opened after them. In-memory buffers and file objects have no
+    path to key on, so they are always parsed and never cached.
+
+    Entries are stored with pickle, so the cache directory must only be
+    writable by trusted users.
+
+    Args:
+        directory (str): Cache directory
+        max_size (int): Maximum total size of cache entries in bytes
+        hash_content (bool): Whether to also key entries on a content hash
+
+    Attributes:
+        directory (Path): Cache directory
+        max_size (int): Maximum total size of cache entries in bytes
+        hash_content (bool): Whether entries are keyed on a content hash
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that parsed the file
+
+    Methods:
+        checklist(self, file) -> dict: Checklist.summary() of a checklist
+        openscap(self, file) -> dict: OpenSCAPSTIGViewerResult.summary() of a result
+        invalidate(self, file): Remove cache entries for a file
+        clear(self): Remove all cache entries
+    """
+
+    loaders: dict = {
+        "checklist": lambda file: Checklist(file).summary(),
+        "openscap": lambda file: OpenSCAPSTIGViewerResult(file).summary(),
+    }
+
+    def __init__(
+        self, directory: str, max_size: int = 256 * 2**20, hash_content: bool = False
+    ):
+        self.directory: Path = Path(directory)
+        self.max_size: int = max_size
+        self.hash_content: bool = hash_content
+        self.hits: int = 0
+        self.misses: int = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index: OrderedDict[Path, int] = None
+        self._size: int = 0
+
+    def checklist(self, file: str) -> dict:
+        """
+        Return the summary of a checklist file, parsing it on a cache miss.
+
+        Args:
+            file (str): Path to checklist file
+
+        Returns:
+            dict: Checklist summary
+        """
+        return self._get("checklist", source_path(file))
+
+    def openscap(self, file: str) -> dict:
+        """
+        Return the summary of an OpenSCAP XCCDF result file, parsing it on a
+        cache miss.
+
+        Args:
+            file (str): Path to XCCDF file
+
+        Returns:
+            dict: Result summary
+        """
+        return self._get("openscap", source_path(file))
+
+    def invalidate(self, file: str):
+        """
+        Remove all cache entries for a file.
+
+        Args:
+            file (str): Path to file
+        """
+        file = source_path(file)
+        if not isinstance(file, CACHEABLE_TYPES):
+            return
+        for kind in self.loaders:
+            entry = self._entry(kind, file)
+            entry.unlink(missing_ok=True)
+            if self._index is not None:
+                self._size -= self._index.pop(entry, 0)
+
+    def clear(self):
+        """
+        Remove all cache entries.
+        """
+        for entry in self.directory.glob("*.pickle"):
+            entry.unlink(missing_ok=True)
+        self._index = OrderedDict()
+        self._size = 0
+
+    def _get(self, kind: str, file: Path) -> dict:
+        """
+        Return a cached summary, or load, store and return it.
+        """
+        if not isinstance(file, CACHEABLE_TYPES):
+            self.misses += 1
+            return self.loaders[kind](file)
+        entry = self._entry(kind, file)
+        signature = self._signature(file)
+        try:
+            with open(entry, "rb") as fh:
+                cached_signature, data = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            cached_signature, data = None, None
+        if cached_signature == signature:
+            self.hits += 1
+            try:
+                os.utime(entry)
+            except FileNotFoundError:
+                # Evicted by another process after it was read
+                if self._index is not None:
+                    self._size -= self._index.pop(entry, 0)
+                return data
+            if self._index is not None and entry in self._index:
+                self._index.move_to_end(entry)
+            return data
+        self.misses += 1
+        data = self.loaders[kind](file)
+        self._store(entry, (signature, data))
+        if self._size > self.max_size:
+            self._evict()
+        return data
+
+    def _entry(self, kind: str, file: Path) -> Path:
+        """
+        Path of the cache entry for a file.
+        """
+        key = f"{CACHE_VERSION}\0{kind}\0{file.resolve()}"
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.pickle"
+
+    def _signature(self, file: Path) -> tuple:
+        """
+        Values that must match for a cache entry to be used.
+        """
+        stat = file.stat()
+        digest = None
+        if self.hash_content:
+            sha256 = hashlib.sha256()
+            with open_source(file) as fh:
+                for chunk in iter(lambda: fh.read(2**20), b""):
+                    sha256.update(chunk)
+            digest = sha256.hexdigest()
+        return (stat.st_size, stat.st_mtime_ns, digest)
+
+    def _store(self, entry: Path, value: tuple):
+        """
+        Write a cache entry atomically and add it to the index.
+        """
+        atomic_write(
+            entry, lambda fh: pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        if self._index is None:
+            self._scan()
+        size = entry.stat().st_size
+        self._size += size - self._index.pop(entry, 0)
+        self._index[entry] = size
+
+    def _scan(self):
+        """
+        Index the entries in the directory by recency, with their sizes.
+        """
+        entries = []
+        for entry in self.directory.glob("*.pickle"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, entry, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((entry, size) for _, entry, size in entries)
+        self._size = sum(self._index.values())
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_size.
+        """
+        while self._size > self.max_size and self._index:
+            entry, size = self._index.popitem(last=False)
+            entry.unlink(missing_ok=True)
+            self._size -= size
@@ -2,9 +2,87 @@
 Interface to DISA checklist files produced by STIG Viewer 2.
 """
 
+import os
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from functools import partial
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
+from .filters import check_fields, filter_values
+from .sources import (
+    COMPRESSORS,
+    SUFFIX_COMPRESSION,
+    atomic_write,
+    open_source,
+    source_compression,
+    source_name,
+    source_path,
+)
+
+OPENSCAP_STATUS: dict = {
+    "pass": "NotAFinding",
+    "fail": "Open",
+    "notapplicable": "Not_Applicable",
+    "notchecked": "Not_Reviewed",
+}
+
+OVERWRITE_POLICIES: set = {
+    "always",
+    "not_reviewed",
+}
+
+MUTABLE_FIELDS: dict = {
+    "status": "STATUS",
+    "finding_details": "FINDING_DETAILS",
+    "comments": "COMMENTS",
+    "severity_override": "SEVERITY_OVERRIDE",
+    "severity_justification": "SEVERITY_JUSTIFICATION",
+}
+
+STIG_DATA_ATTRIBUTES: tuple = (
+    "Vuln_Num",
+    "Severity",
+    "Group_Title",
+    "Rule_ID",
+    "Rule_Ver",
+    "Rule_Title",
+    "Vuln_Discuss",
+    "IA_Controls",
+    "Check_Content",
+    "Fix_Text",
+    "False_Positives",
+    "False_Negatives",
+    "Documentable",
+    "Mitigations",
+    "Potential_Impact",
+    "Third_Party_Tools",
+    "Mitigation_Control",
+    "Responsibility",
+    "Security_Override_Guidance",
+    "Check_Content_Ref",
+    "Weight",
+    "Class",
+    "STIGRef",
+    "TargetKey",
+    "STIG_UUID",
+    "LEGACY_ID",
+    "CCI_REF",
+)
+
+QUERY_FIELDS: tuple = tuple(MUTABLE_FIELDS) + STIG_DATA_ATTRIBUTES
+
+PENDING_PER_WORKER: int = 4
+
+CHECKLIST_ATTRIBUTES: set = {
+    "STIG_UUID",
+}
+
 
 class DictNode:
     """
@@ -16,6 +94,7 @@ class DictNode:
         self._prefix: str = prefix
         self._suffix: str = suffix
         self.immutable: bool = immutable
+        self.dirty: bool = False
 
     def get(self, key: str) -> str:
         """
@@ -31,7 +110,7 @@ class DictNode:
             KeyError: If key not found
         """
         try:
-            value = self.node.find(f"{self._prefix}{key}{self._suffix}")
+            value = self._lookup(key)
         except AttributeError as exc:
             raise KeyError(f"{key} not found in {self.node.tag}") from exc
         return None if value is None else value.text
@@ -53,9 +132,22 @@ class DictNode:
                 f"Node is write protected. Cannot set {key} to {value}"
             )
         try:
-            self.node.find(f"{self._prefix}{key}{self._suffix}").text = value
+            self._lookup(key).text = value
         except AttributeError as exc:
             raise KeyError(f"{key} not found in {self.node.tag}") from exc
+        self.dirty = True
+
+    def _lookup(self, key: str) -> ET.Element:
+        """
+        Find the element holding the value for key.
+
+        Args:
+            key (str): Key
+
+        Returns:
+            ET.Element: Value element, or None if key not found
+        """
+        return self.node.find(f"{self._prefix}{key}{self._suffix}")
 
     def items(self):
         """
@@ -112,20 +204,35 @@ class StigInfoNode(DictNode):
         prefix: str = './/SI_DATA/SID_NAME[.="'
         suffix: str = '"]/../SID_DATA'
         super().__init__(node, prefix, suffix, immutable)
+        self._entries: list[tuple[str, ET.Element]] = None
+        self._index: dict[str, ET.Element] = None
 
-    def items(self) -> list[str]:
-        key = ".//SID_NAME"
-        value = ".//SID_DATA"
-        result = []
+    def _build_index(self):
+        """
+        Index SID_DATA elements by SID_NAME in a single pass over the SI_DATA
+        children. SID_DATA is None for entries that have no value element.
+        """
+        entries = []
+        index = {}
         for sid in self.node:
-            x = sid.find(key).text
-            try:
-                y = sid.find(value).text
-            except AttributeError:
-                sid.makeelement(value, {}).text = ""
-                y = ""
-            result.append((x, y))
-        return result
+            name = sid.findtext("SID_NAME")
+            data = sid.find("SID_DATA")
+            entries.append((name, data))
+            index.setdefault(name, data)
+        self._entries = entries
+        self._index = index
+
+    def _lookup(self, key: str) -> ET.Element:
+        if self._index is None:
+            self._build_index()
+        return self._index.get(key)
+
+    def items(self) -> list[str]:
+        if self._entries is None:
+            self._build_index()
+        return [
+            (name, "" if data is None else data.text) for name, data in self._entries
+        ]
 
 
 class VulnNode(DictNode):
@@ -140,6 +247,7 @@ class VulnNode(DictNode):
         immutable (bool): Whether dict interface is immutable
         prefix (str): Element lookup prefix
         suffix (str): Element lookup suffix
+        dirty (bool): Whether a mutable field was set since load or save
 
     Properties:
         vuln_num (str): V-ID (immutable)
@@ -156,57 +264,240 @@ class VulnNode(DictNode):
         prefix: str = './/STIG_DATA/VULN_ATTRIBUTE[.="'
         suffix: str = '"]/../ATTRIBUTE_DATA'
         super().__init__(node, prefix, suffix, immutable)
+        self._attributes: list[tuple[str, ET.Element]] = None
+        self._index: dict[str, ET.Element] = None
+        self._fields: dict[str, ET.Element] = None
+        self._on_change = None
+
+    def _build_index(self):
+        """
+        Index STIG_DATA values by attribute name and mutable fields by tag in
+        a single pass over the VULN children.
+
+        Attributes that repeat (LEGACY_ID, CCI_REF) keep their first value in
+        the index; all values are kept in order for items().
+        """
+        attributes = []
+        index = {}
+        fields = {}
+        for child in self.node:
+            if child.tag == "STIG_DATA":
+                name = child.findtext("VULN_ATTRIBUTE")
+                data = child.find("ATTRIBUTE_DATA")
+                attributes.append((name, data))
+                index.setdefault(name, data)
+            else:
+                fields.setdefault(child.tag, child)
+        self._attributes = attributes
+        self._index = index
+        self._fields = fields
+
+    def _lookup(self, key: str) -> ET.Element:
+        if self._index is None:
+            self._build_index()
+        return self._index.get(key)
+
+    def _field(self, tag: str) -> ET.Element:
+        if self._fields is None:
+            self._build_index()
+        return self._fields.get(tag)
+
+    def _set_field(self, tag: str, value: str):
+        self._field(tag).text = value
+        self.dirty = True
+        if self._on_change is not None:
+            self._on_change(tag)
 
     @property
     def vuln_num(self) -> str:
-        return self.node.find(f"{self._prefix}Vuln_Num{self._suffix}").text
+        return self.get("Vuln_Num")
 
     @property
     def status(self) -> str:
-        return self.node.find("STATUS").text
+        return self._field("STATUS").text
 
     @status.setter
     def status(self, value: str):
-        self.node.find("STATUS").text = value
+        self._set_field("STATUS", value)
 
     @property
     def finding_details(self) -> str:
-        return self.node.find("FINDING_DETAILS").text
+        return self._field("FINDING_DETAILS").text
 
     @finding_details.setter
     def finding_details(self, value: str):
-        self.node.find("FINDING_DETAILS").text = value
+        self._set_field("FINDING_DETAILS", value)
 
     @property
     def comments(self) -> str:
-        return self.node.find("COMMENTS").text
+        return self._field("COMMENTS").text
 
     @comments.setter
     def comments(self, value: str):
-        self.node.find("COMMENTS").text = value
+        self._set_field("COMMENTS", value)
 
     @property
     def severity_override(self) -> str:
-        return self.node.find("SEVERITY_OVERRIDE").text
+        return self._field("SEVERITY_OVERRIDE").text
 
     @severity_override.setter
     def severity_override(self, value: str):
-        self.node.find("SEVERITY_OVERRIDE").text = value
+        self._set_field("SEVERITY_OVERRIDE", value)
 
     @property
     def severity_justification(self) -> str:
-        return self.node.find("SEVERITY_JUSTIFICATION").text
+        return self._field("SEVERITY_JUSTIFICATION").text
 
     @severity_justification.setter
     def severity_justification(self, value: str):
-        self.node.find("SEVERITY_JUSTIFICATION").text = value
+        self._set_field("SEVERITY_JUSTIFICATION", value)
 
     def items(self) -> list[str]:
-        key = ".//VULN_ATTRIBUTE"
-        value = ".//ATTRIBUTE_DATA"
-        return [
-            (x.find(key).text, x.find(value).text) for x in self.node.iter("STIG_DATA")
-        ]
+        if self._attributes is None:
+            self._build_index()
+        return [(name, data.text) for name, data in self._attributes]
+
+
+class VulnNodes(Mapping):
+    """
+    Mapping of V-ID to VulnNode for the VULN elements of a STIG, built lazily.
+
+    The V-ID index is built on first lookup by reading only the Vuln_Num of
+    each VULN, and a VulnNode wrapper is created only for the V-IDs that are
+    accessed.
+
+    Queries are answered from secondary indexes of field value to V-IDs,
+    built for each field on first use. The index of a mutable field is
+    dropped when a VulnNode setter changes that field; changes made directly
+    to the element tree are not tracked.
+
+    Args:
+        stig (ET.Element): iSTIG node
+    """
+
+    def __init__(self, stig: ET.Element):
+        self._stig: ET.Element = stig
+        self._elements: dict[str, ET.Element] = None
+        self._nodes: dict[str, VulnNode] = {}
+        self._field_indexes: dict[str, dict[str, set[str]]] = {}
+
+    def _index(self) -> dict[str, ET.Element]:
+        if self._elements is None:
+            self._elements = {_vuln_num(x): x for x in self._stig.iterfind("VULN")}
+        return self._elements
+
+    def __getitem__(self, vid: str) -> VulnNode:
+        node = self._nodes.get(vid)
+        if node is None:
+            node = VulnNode(self._index()[vid])
+            node._on_change = self._field_changed
+            self._nodes[vid] = node
+        return node
+
+    def __contains__(self, vid: str) -> bool:
+        return vid in self._index()
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def dirty(self) -> list[VulnNode]:
+        """
+        Return the VulnNodes modified through their setters. Only nodes that
+        have been accessed can be modified, so the rest are not checked.
+        """
+        return [x for x in self._nodes.values() if x.dirty]
+
+    def field_index(self, field: str) -> dict[str, set[str]]:
+        """
+        Return the index of a field's values to V-IDs, building it on first
+        use.
+
+        Args:
+            field (str): Mutable field name (status, finding_details, comments,
+                severity_override, severity_justification) or STIG_DATA
+                attribute name (Severity, Rule_Ver, CCI_REF, ...)
+
+        Returns:
+            dict[str, set[str]]: V-IDs by field value. Attributes that repeat,
+                such as CCI_REF, index every value.
+
+        Raises:
+            ValueError: If the field is not in QUERY_FIELDS
+        """
+        index = self._field_indexes.get(field)
+        if index is None:
+            check_fields((field,), QUERY_FIELDS)
+            index = {}
+            tag = MUTABLE_FIELDS.get(field)
+            for vid, vuln in self._index().items():
+                for value in _field_values(vuln, field, tag):
+                    index.setdefault(value, set()).add(vid)
+            self._field_indexes[field] = index
+        return index
+
+    def query(self, **predicates) -> list[VulnNode]:
+        """
+        Return the VulnNodes matching all predicates, in document order.
+
+        Each predicate is a field name as accepted by field_index() and
+        either a value to match, or a set, list or tuple of values any of
+        which may match.
+
+        Args:
+            **predicates: Field predicates, e.g. status="Open",
+                Severity={"high", "medium"}
+
+        Returns:
+            list[VulnNode]: Matching vulnerabilities
+
+        Raises:
+            ValueError: If a field is not in QUERY_FIELDS
+        """
+        check_fields(predicates, QUERY_FIELDS)
+        matches = None
+        for field, value in predicates.items():
+            index = self.field_index(field)
+            vids = set().union(*(index.get(x, ()) for x in filter_values(value)))
+            matches = vids if matches is None else matches & vids
+            if not matches:
+                return []
+        return [self[x] for x in self._index() if matches is None or x in matches]
+
+    def _field_changed(self, tag: str):
+        """
+        Drop the index of a mutable field changed through a VulnNode setter.
+        """
+        for field, field_tag in MUTABLE_FIELDS.items():
+            if field_tag == tag:
+                self._field_indexes.pop(field, None)
+
+
+def _field_values(vuln: ET.Element, field: str, tag: str = None) -> list[str]:
+    """
+    Values of a mutable field or STIG_DATA attribute of a VULN element.
+    """
+    if tag is not None:
+        elem = vuln.find(tag)
+        return [None if elem is None else elem.text]
+    return [
+        data[1].text if len(data) > 1 else None
+        for data in vuln.iterfind("STIG_DATA")
+        if data.findtext("VULN_ATTRIBUTE") == field
+    ]
+
+
+def _vuln_num(vuln: ET.Element) -> str:
+    """
+    Read the V-ID of a VULN element. Vuln_Num is normally the first STIG_DATA,
+    so this stops after a single child.
+    """
+    for data in vuln.iterfind("STIG_DATA"):
+        if data.findtext("VULN_ATTRIBUTE") == "Vuln_Num":
+            return data.findtext("ATTRIBUTE_DATA")
+    return None
 
 
 class StigNode:
@@ -218,18 +509,13 @@ class StigNode:
 
     Attributes:
         info (StigInfoNode): STIG_INFO node
-        vuln_nodes (dict[str, VulnNode]): VULN nodes
+        vuln_nodes (VulnNodes): Lazily built mapping of V-ID to VULN node
     """
 
     def __init__(self, stig: ET.Element):
         self.node: ET.Element = stig
         self.info: StigInfoNode = StigInfoNode(self.node.find(".//STIG_INFO"))
-        self.vuln_nodes: dict[str, VulnNode] = {
-            x.find(
-                './/STIG_DATA/VULN_ATTRIBUTE[.="Vuln_Num"]/../ATTRIBUTE_DATA'
-            ).text: VulnNode(x)
-            for x in self.node.findall("VULN")
-        }
+        self.vuln_nodes: VulnNodes = VulnNodes(self.node)
 
     @property
     def stigid(self) -> str:
@@ -243,13 +529,158 @@ class StigNode:
     def releaseinfo(self) -> str:
         return self.info.get("releaseinfo")
 
+    def query(self, **predicates) -> list[VulnNode]:
+        """
+        Return the vulnerabilities of the STIG matching all predicates.
+
+        Args:
+            **predicates: Field predicates, as for VulnNodes.query()
+
+        Returns:
+            list[VulnNode]: Matching vulnerabilities, in document order
+
+        Raises:
+            ValueError: If a field is not in QUERY_FIELDS
+        """
+        return self.vuln_nodes.query(**predicates)
+
+
+class StigTemplate:
+    """
+    STIG_DATA elements of one STIG release, shared by the checklists that
+    use it.
+
+    Args:
+        key (tuple[str, str, str]): (stigid, version, releaseinfo)
+
+    Attributes:
+        key (tuple[str, str, str]): (stigid, version, releaseinfo)
+        vulns (dict[str, tuple[ET.Element]]): STIG_DATA elements by V-ID
+    """
+
+    def __init__(self, key: tuple):
+        self.key: tuple[str, str, str] = key
+        self.vulns: dict[str, tuple[ET.Element]] = {}
+
+    def intern(self, vuln: ET.Element) -> bool:
+        """
+        Replace the STIG_DATA children of a VULN with the shared elements of
+        the template. The first VULN seen for a V-ID becomes the template.
+        VULNs whose STIG data differs from the template keep their own.
+        Values assigned per checklist (CHECKLIST_ATTRIBUTES) are not compared
+        and each VULN keeps its own element for them.
+
+        Args:
+            vuln (ET.Element): VULN node
+
+        Returns:
+            bool: Whether the VULN now shares the template's STIG_DATA
+        """
+        positions = [i for i, x in enumerate(vuln) if x.tag == "STIG_DATA"]
+        vid = _vuln_num(vuln)
+        shared = self.vulns.get(vid)
+        if shared is None:
+            self.vulns[vid] = tuple(vuln[i] for i in positions)
+            return True
+        if len(shared) != len(positions):
+            return False
+        pairs = list(zip(positions, shared))
+        for i, data in pairs:
+            if vuln[i] is not data and _stig_data_key(vuln[i]) != _stig_data_key(data):
+                return False
+        for i, data in pairs:
+            if _stig_data_attribute(data) not in CHECKLIST_ATTRIBUTES:
+                vuln[i] = data
+        return True
+
+
+class StigTemplates:
+    """
+    Registry of shared STIG templates keyed by (stigid, version,
+    releaseinfo).
+
+    Checklists loaded with the same registry share one copy of the STIG_DATA
+    of each STIG release, so only the asset, STIG info and the per-VULN
+    status, finding details, comments and severity override elements are
+    held per checklist. STIG data is read-only through the Checklist
+    interface; shared STIG_DATA elements must not be modified through the
+    element tree.
+
+    Attributes:
+        templates (dict[tuple, StigTemplate]): Templates by key
+
+    Methods:
+        template(self, stig) -> StigTemplate: Template for a STIG node
+        intern(self, stig) -> int: Share the STIG data of a STIG node
+    """
+
+    def __init__(self):
+        self.templates: dict[tuple, StigTemplate] = {}
+
+    def template(self, stig: StigNode) -> StigTemplate:
+        """
+        Return the template for the release of a STIG, creating it if needed.
+
+        Args:
+            stig (StigNode): STIG node
+
+        Returns:
+            StigTemplate: Template
+        """
+        key = (stig.stigid, stig.version, stig.releaseinfo)
+        template = self.templates.get(key)
+        if template is None:
+            template = self.templates[key] = StigTemplate(key)
+        return template
+
+    def intern(self, stig: StigNode) -> int:
+        """
+        Share the STIG data of every VULN of a STIG node with its template.
+
+        Args:
+            stig (StigNode): STIG node
+
+        Returns:
+            int: Number of VULNs sharing template data
+        """
+        template = self.template(stig)
+        return sum(template.intern(x) for x in stig.node.iterfind("VULN"))
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+
+def _stig_data_attribute(data: ET.Element) -> str:
+    """
+    VULN_ATTRIBUTE name of a STIG_DATA element.
+    """
+    return data.findtext("VULN_ATTRIBUTE")
+
+
+def _stig_data_key(data: ET.Element) -> tuple:
+    """
+    Comparable value of a STIG_DATA element. Only the name of a per-checklist
+    attribute is compared, not its value.
+    """
+    attribute = _stig_data_attribute(data)
+    if attribute in CHECKLIST_ATTRIBUTES:
+        return (attribute,)
+    return tuple((x.tag, x.text) for x in data)
+
 
 class Checklist:
     """
     Interface to parse and build DISA checklist files.
 
+    Args:
+        file (str): Path to checklist file, or an archive member, bytes-like
+            object or binary file object holding one
+        autoload (bool): Whether to load the data immediately
+        templates (StigTemplates): Registry to share STIG data through
+
     Attributes:
-        file (Path): Path to checklist file
+        file (Path): Path to checklist file, or the non-path source
+        templates (StigTemplates): Registry the STIG data is shared through
         tree (ET.ElementTree): ElementTree object
         root (ET.Element): Root element
         asset (AssetNode): Asset element
@@ -257,15 +688,24 @@ class Checklist:
 
     Methods:
         load(self): Load checklist XML data from file
+        iter_vulns(file): Stream (StigInfoNode, VulnNode) pairs from a file
+        peek(file): Read only the asset and STIG info of a file
         as_dict(self) -> dict: Return a summary of checklist data as a dictionary
+        summary(self) -> dict: Return asset, STIG info and vulnerability status
+        query(self, **predicates) -> list[VulnNode]: Filter vulnerabilities
+        apply_openscap(self, result) -> dict: Set statuses from OpenSCAP results
     """
 
-    def __init__(self, file: str, autoload: bool = True):
+    def __init__(
+        self, file: str, autoload: bool = True, templates: StigTemplates = None
+    ):
         self.tree: ET.ElementTree = None
         self.root: ET.Element = None
         self.asset: AssetNode = None
         self.stigs: list[StigNode] = []
-        self.file: Path = Path(file)
+        self.file: Path = source_path(file)
+        self.templates: StigTemplates = templates
+        self._source_stat: tuple = None
         if autoload:
             self.load()
 
@@ -289,10 +729,225 @@ class Checklist:
             ],
         }
 
-    def load(self):
+    def summary(self) -> dict:
+        """
+        Return a compact, picklable summary of the checklist with the status
+        and severity of each vulnerability.
+
+        Returns:
+            dict: Checklist summary
+        """
+        return {
+            "file": source_name(self.file),
+            "asset": self.asset.as_dict(),
+            "stigs": [
+                {
+                    "info": stig.info.as_dict(),
+                    "vulnerabilities": {
+                        vid: {
+                            "status": vuln.status,
+                            "severity": vuln.get("Severity"),
+                            "severity_override": vuln.severity_override,
+                        }
+                        for vid, vuln in stig.vuln_nodes.items()
+                    },
+                }
+                for stig in self.stigs
+            ],
+        }
+
+    def query(self, **predicates) -> list[VulnNode]:
+        """
+        Return the vulnerabilities of all STIGs matching all predicates.
+
+        Args:
+            **predicates: Field predicates, as for VulnNodes.query(), e.g.
+                status="Open", Severity={"high", "medium"}
+
+        Returns:
+            list[VulnNode]: Matching vulnerabilities, STIG by STIG
+
+        Raises:
+            ValueError: If a field is not in QUERY_FIELDS
+        """
+        check_fields(predicates, QUERY_FIELDS)
+        return [x for stig in self.stigs for x in stig.query(**predicates)]
+
+    def apply_openscap(
+        self,
+        result,
+        mapping: dict = None,
+        overwrite_policy: str = "always",
+        finding_details: bool = False,
+    ) -> dict:
+        """
+        Set vulnerability statuses from OpenSCAP rule results in one pass.
+
+        Rule results are joined to VULNs by V-ID, and XCCDF result values are
+        mapped to checklist statuses. Results without a mapping (error,
+        unknown, notselected, ...) leave the VULN untouched.
+
+        Args:
+            result (OpenSCAPSTIGViewerResult): OpenSCAP XCCDF result
+            mapping (dict): XCCDF result to checklist status mapping.
+                Defaults to OPENSCAP_STATUS.
+            overwrite_policy (str): "always" to overwrite any status, or
+                "not_reviewed" to only set VULNs that are Not_Reviewed
+            finding_details (bool): Whether to fill FINDING_DETAILS of the
+                updated VULNs with the rule ID, result and scan time. Unchanged
+                VULNs are left as they are.
+
+        Returns:
+            dict: V-IDs that were updated (with old and new status),
+                unchanged, skipped, or missing from the checklist
+
+        Raises:
+            ValueError: If overwrite_policy is not recognized
+        """
+        if overwrite_policy not in OVERWRITE_POLICIES:
+            raise ValueError(
+                f"Unknown overwrite policy {overwrite_policy}. "
+                f"Use one of {sorted(OVERWRITE_POLICIES)}."
+            )
+        mapping = OPENSCAP_STATUS if mapping is None else mapping
+        summary = {"updated": {}, "unchanged": [], "skipped": [], "missing": []}
+        for vid, rule in result.rule_results.items():
+            stig = next((x for x in self.stigs if vid in x.vuln_nodes), None)
+            if stig is None:
+                summary["missing"].append(vid)
+                continue
+            vuln = stig.vuln_nodes[vid]
+            status = mapping.get(rule.result)
+            current = vuln.status
+            if status is None or (
+                overwrite_policy == "not_reviewed" and current != "Not_Reviewed"
+            ):
+                summary["skipped"].append(vid)
+                continue
+            if status == current:
+                summary["unchanged"].append(vid)
+                continue
+            vuln.status = status
+            if finding_details:
+                vuln.finding_details = (
+                    f"OpenSCAP result: {rule.result}\n"
+                    f"Rule: {rule.rule_id}\n"
+                    f"Time: {rule.time.isoformat()}"
+                )
+            summary["updated"][vid] = (current, status)
+        return summary
+
+    @classmethod
+    def iter_vulns(cls, file: str):
+        """
+        Stream vulnerabilities from a checklist file one VULN at a time.
+
+        The file is read with an incremental parser, and each VULN element is
+        cleared and detached from its STIG once the caller advances the
+        iterator, so memory use stays flat regardless of how many VULNs or
+        STIGs the file holds. Yielded nodes are only valid until the next
+        item is requested.
+
+        Args:
+            file (str): Path to checklist file
+
+        Yields:
+            tuple[StigInfoNode, VulnNode]: STIG info of the enclosing STIG and
+                the vulnerability node
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        stigs: ET.Element = None
+        stig: ET.Element = None
+        info: StigInfoNode = None
+        with open_source(file) as fh:
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == "STIGS":
+                        stigs = elem
+                    elif elem.tag == "iSTIG":
+                        stig = elem
+                    continue
+                if elem.tag == "STIG_INFO":
+                    info = StigInfoNode(elem)
+                elif elem.tag == "VULN":
+                    yield info, VulnNode(elem)
+                    elem.clear()
+                    stig.remove(elem)
+                elif elem.tag == "iSTIG":
+                    elem.clear()
+                    stigs.remove(elem)
+                    info = None
+
+    @classmethod
+    def peek(cls, file: str, chunk_size: int = 65536) -> tuple[AssetNode, list[dict]]:
+        """
+        Read only the ASSET block and the STIG_INFO of each STIG.
+
+        Bytes are handed to an incremental parser up to the first VULN of each
+        STIG. Everything from there to the closing iSTIG tag is skipped with a
+        plain byte search and never reaches the parser, so scanning is bound
+        by I/O rather than by building the full tree.
+
+        Args:
+            file (str): Path to checklist file
+            chunk_size (int): Number of bytes read at a time
+
+        Returns:
+            tuple[AssetNode, list[dict]]: Asset node and the STIG info of each
+                STIG as a dictionary
+
+        Raises:
+            ET.ParseError: If the header is not well-formed XML
+        """
+        vuln_start = b"<VULN"
+        stig_end = b"</iSTIG>"
+        parser = ET.XMLParser()
+        buffer = b""
+        skipping = False
+        with open_source(file) as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                buffer += chunk
+                marker = stig_end if skipping else vuln_start
+                index = buffer.find(marker)
+                while index != -1:
+                    if skipping:
+                        buffer = buffer[index:]
+                    else:
+                        parser.feed(buffer[:index])
+                        buffer = buffer[index:]
+                    skipping = not skipping
+                    marker = stig_end if skipping else vuln_start
+                    index = buffer.find(marker)
+                if not chunk:
+                    break
+                keep = len(marker) - 1
+                if not skipping:
+                    parser.feed(buffer[:-keep])
+                buffer = buffer[-keep:]
+        if not skipping:
+            parser.feed(buffer)
+        root = parser.close()
+        asset = AssetNode(root.find("ASSET"))
+        stigs = [
+            StigInfoNode(x).as_dict() for x in root.iterfind("STIGS/iSTIG/STIG_INFO")
+        ]
+        return asset, stigs
+
+    def load(self, file=None):
         """
         Load checklist XML data from file.
+
+        Args:
+            file: Source to load instead of the current one
+
+        Raises:
+            ValueError: If the XML is not a checklist
         """
+        if file is not None:
+            self.file = source_path(file)
         self._parse()
         self._load_asset()
         self._load_stigs()
@@ -302,7 +957,9 @@ class Checklist:
         Parse XML.
         """
         try:
-            self.tree = ET.parse(self.file)
+            self._source_stat = _stat_key(self.file)
+            with open_source(self.file) as fh:
+                self.tree = ET.parse(fh)
             self.root = self.tree.getroot()
         except ET.ParseError as exc:
             raise exc
@@ -311,28 +968,271 @@ class Checklist:
         """
         Load asset data.
         """
-        self.asset = AssetNode(self.root.find(".//ASSET"))
+        asset = self.root.find(".//ASSET")
+        if asset is None:
+            raise ValueError(f"{source_name(self.file)} has no ASSET element")
+        self.asset = AssetNode(asset)
 
     def _load_stigs(self):
         """
         Load stig data.
         """
+        if self.root.find(".//STIGS") is None:
+            raise ValueError(f"{source_name(self.file)} has no STIGS element")
         self.stigs = [StigNode(x) for x in self.root.findall(".//STIGS/iSTIG")]
+        if self.templates is not None:
+            for stig in self.stigs:
+                self.templates.intern(stig)
 
-    def save(self, output_file: Path, force: bool = False):
+    def save(
+        self,
+        output_file: Path,
+        force: bool = False,
+        compression: str = None,
+        incremental: bool = False,
+    ):
         """
         Save checklist XML to specified file.
 
+        The document is written through a large buffer to a temporary file in
+        the same directory, synced to disk and moved into place with
+        os.replace, so an interrupted save never leaves a partial checklist.
+
+        With incremental=True, the bytes of the file the checklist was loaded
+        from are reused and only the ASSET block and VULNs changed through
+        their setters are re-serialized. Saving an unchanged checklist over
+        its own file is a no-op. Changes made directly to the element tree
+        are not tracked; if the source file has changed since it was loaded,
+        the whole document is serialized instead. Compressed sources are
+        decompressed as they are read.
+
         Args:
             output_file (Path): Path to output file
+            force (bool): Whether to overwrite an existing file
+            compression (str): "gzip", "xz" or "bz2". Defaults to the
+                compression matching the output file suffix, or plain XML
+            incremental (bool): Whether to splice changes into the source bytes
+
+        Raises:
+            FileExistsError: If output file exists and force is not set
+            ValueError: If compression is not recognized
         """
+        output_file = Path(output_file)
+        if compression is None:
+            compression = SUFFIX_COMPRESSION.get(output_file.suffix.lower())
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(
+                f"Unknown compression {compression}. Use one of {sorted(COMPRESSORS)}."
+            )
         if not output_file.parent.is_dir():
             output_file.parent.mkdir(parents=True)
-        if output_file.exists():
-            if not force:
-                raise FileExistsError(
-                    f"{output_file} already exists. Pass 'force=True' to overwrite."
+        if output_file.exists() and not force:
+            raise FileExistsError(
+                f"{output_file} already exists. Pass 'force=True' to overwrite."
+            )
+        same_file = (
+            isinstance(self.file, Path)
+            and output_file.resolve() == self.file.resolve()
+        )
+        write = self._write
+        if incremental and _stat_key(self.file) == self._source_stat:
+            dirty = self._dirty_elements()
+            if (
+                not dirty
+                and same_file
+                and compression == source_compression(self.file)
+            ):
+                return
+            splices = self._splices(dirty)
+            if splices is not None:
+                write = partial(self._write_spliced, splices)
+        atomic_write(output_file, write, compression)
+        if same_file:
+            self._mark_clean()
+
+    def _write(self, fh):
+        """
+        Serialize the checklist to a binary file object.
+        """
+        self.tree.write(fh)
+
+    def _dirty_elements(self) -> list[ET.Element]:
+        """
+        Return the ASSET and VULN elements changed since load or save.
+        """
+        dirty = [self.asset.node] if self.asset.dirty else []
+        for stig in self.stigs:
+            dirty.extend(x.node for x in stig.vuln_nodes.dirty())
+        return dirty
+
+    def _splices(self, dirty: list[ET.Element]) -> tuple[bytes, list]:
+        """
+        Match dirty elements to their byte spans in the source file.
+
+        Returns:
+            tuple[bytes, list]: Source bytes and sorted (start, end, element)
+                spans, or None if the source can no longer be read, e.g. a
+                closed file object, or cannot be matched to the tree
+        """
+        try:
+            with open_source(self.file) as fh:
+                data = fh.read()
+        except (OSError, ValueError):
+            return None
+        vulns = [
+            vuln
+            for stig in self.root.iterfind("STIGS/iSTIG")
+            for vuln in stig.iterfind("VULN")
+        ]
+        asset_spans = _element_spans(data, b"ASSET")
+        vuln_spans = _element_spans(data, b"VULN")
+        if len(asset_spans) != 1 or len(vuln_spans) != len(vulns):
+            return None
+        spans = {id(self.asset.node): asset_spans[0]}
+        spans.update((id(x), span) for x, span in zip(vulns, vuln_spans))
+        return data, sorted(spans[id(x)] + (x,) for x in dirty)
+
+    def _write_spliced(self, splices: tuple[bytes, list], fh):
+        """
+        Write the source bytes with dirty elements re-serialized in place.
+        """
+        data, spans = splices
+        view = memoryview(data)
+        position = 0
+        for start, end, elem in spans:
+            fh.write(view[position:start])
+            tail, elem.tail = elem.tail, None
+            try:
+                fh.write(
+                    ET.tostring(elem, encoding="utf-8", short_empty_elements=False)
                 )
-            else:
-                output_file.unlink()
-        self.tree.write(output_file)
+            finally:
+                elem.tail = tail
+            position = end
+        fh.write(view[position:])
+
+    def _mark_clean(self):
+        """
+        Reset dirty flags after the checklist has been saved over its source.
+        """
+        self.asset.dirty = False
+        for stig in self.stigs:
+            for vuln in stig.vuln_nodes.dirty():
+                vuln.dirty = False
+        self._source_stat = _stat_key(self.file)
+
+
+def _stat_key(file: Path) -> tuple:
+    """
+    Size and modification time of a file, or None if it does not exist or
+    the source is not a file. In-memory sources are assumed not to change.
+    """
+    if not hasattr(file, "stat"):
+        return None
+    try:
+        stat_result = file.stat()
+    except FileNotFoundError:
+        return None
+    return (stat_result.st_size, stat_result.st_mtime_ns)
+
+
+def _element_spans(data: bytes, tag: bytes) -> list[tuple[int, int]]:
+    """
+    Byte spans of the non-nested elements with a tag, in document order.
+    Checklist text is escaped, so tags cannot occur inside values.
+    """
+    start_tag = b"<" + tag + b">"
+    end_tag = b"</" + tag + b">"
+    spans = []
+    start = data.find(start_tag)
+    while start != -1:
+        end = data.find(end_tag, start)
+        if end == -1:
+            break
+        end += len(end_tag)
+        spans.append((start, end))
+        start = data.find(start_tag, end)
+    return spans
+
+
+def _load_summary(file: Path) -> tuple[Path, dict, Exception]:
+    """
+    Load a checklist and summarize it, returning any error instead of raising
+    so one bad file does not abort a batch.
+    """
+    try:
+        return file, Checklist(file).summary(), None
+    except Exception as exc:
+        return file, None, exc
+
+
+def iter_many(files: list[str], workers: int = None):
+    """
+    Load many checklist files in parallel and yield their summaries as they
+    complete.
+
+    Files are parsed in a process pool with at most PENDING_PER_WORKER files
+    in flight per worker, so only the summaries not yet consumed are held in
+    memory. Files that fail to load are yielded with their error without
+    aborting the batch.
+
+    Args:
+        files (list[str]): Paths to checklist files
+        workers (int): Number of worker processes. Defaults to the number of
+            processors; 1 loads the files in the current process.
+
+    Yields:
+        tuple[Path, dict, Exception]: File path, and its summary or the
+            error it failed with, in the order the files finish loading
+    """
+    files = [source_path(x) for x in files]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        yield from map(_load_summary, files)
+        return
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file in files:
+            pending.add(executor.submit(_load_summary, file))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def load_many(
+    files: list[str], workers: int = None
+) -> tuple[dict[Path, dict], dict[Path, Exception]]:
+    """
+    Load many checklist files in parallel and summarize them.
+
+    Files are parsed with iter_many(), and each worker returns the compact
+    summary from Checklist.summary() rather than ElementTree objects. Files
+    that fail to load are reported in the errors dictionary without
+    aborting the batch. Use iter_many() to consume summaries as they
+    complete instead of holding them all.
+
+    Args:
+        files (list[str]): Paths to checklist files
+        workers (int): Number of worker processes. Defaults to the number of
+            processors; 1 loads the files in the current process.
+
+    Returns:
+        tuple[dict[Path, dict], dict[Path, Exception]]: Summaries and errors,
+            keyed by file path in the order of files
+    """
+    files = [source_path(x) for x in files]
+    summaries = {}
+    errors = {}
+    for file, summary, error in iter_many(files, workers=workers):
+        if error is None:
+            summaries[file] = summary
+        else:
+            errors[file] = error
+    order = {x: i for i, x in reversed(list(enumerate(files)))}
+    return (
+        dict(sorted(summaries.items(), key=lambda x: order[x[0]])),
+        dict(sorted(errors.items(), key=lambda x: order[x[0]])),
+    )
@@ -0,0 +1,346 @@
+"""
+Compact delta storage for checklists: the per-asset fields of a checklist
+are stored apart from its STIG templates, which are kept once in a
+content-addressed store, and full STIG Viewer checklists are rendered from
+them on demand.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+from .checklist import CHECKLIST_ATTRIBUTES, Checklist, StigTemplates
+from .sources import SUFFIX_COMPRESSION, atomic_write, open_source
+
+DELTA_FORMAT: str = "pigsty-delta"
+
+DELTA_VERSION: int = 2
+
+TEMPLATE_CACHE_SIZE: int = 8
+
+HEADER_READ_SIZE: int = 2**12
+
+CKL_HEADER: str = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n<!--DISA STIG Viewer :: 2.17-->\n'
+)
+
+
+class TemplateStore:
+    """
+    Content-addressed store of STIG templates. A template holds the
+    STIG_DATA of every VULN of one STIG release and is stored once as
+    gzip-compressed JSON named by the SHA-256 of its canonical form, however
+    many deltas refer to it.
+
+    Args:
+        directory (str): Store directory
+
+    Attributes:
+        directory (Path): Store directory
+
+    Methods:
+        put(self, template) -> str: Store a template and return its digest
+        get(self, digest) -> dict: Read a template by digest
+    """
+
+    def __init__(self, directory: str):
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._loaded: dict[str, dict] = {}
+
+    def put(self, template: dict) -> str:
+        """
+        Store a template unless it is already present.
+
+        Args:
+            template (dict): Template as returned by stig_template()
+
+        Returns:
+            str: SHA-256 digest of the template
+        """
+        data = _canonical(template)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            atomic_write(path, lambda fh: fh.write(data), "gzip")
+        return digest
+
+    def get(self, digest: str) -> dict:
+        """
+        Read a template, keeping the most recently used ones in memory.
+
+        Args:
+            digest (str): SHA-256 digest of the template
+
+        Returns:
+            dict: Template
+
+        Raises:
+            KeyError: If the template is not in the store
+        """
+        template = self._loaded.pop(digest, None)
+        if template is None:
+            try:
+                with open_source(self._path(digest)) as fh:
+                    template = json.load(fh)
+            except FileNotFoundError as exc:
+                raise KeyError(f"Template {digest} not found") from exc
+        self._loaded[digest] = template
+        while len(self._loaded) > TEMPLATE_CACHE_SIZE:
+            del self._loaded[next(iter(self._loaded))]
+        return template
+
+    def __contains__(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.json.gz"
+
+
+def stig_template(stig: ET.Element) -> dict:
+    """
+    Build the template of an iSTIG element: the STIG_DATA of every VULN in
+    document order. Values assigned per checklist (CHECKLIST_ATTRIBUTES) are
+    left out, so checklists of the same STIG release share one template.
+
+    Args:
+        stig (ET.Element): iSTIG node
+
+    Returns:
+        dict: Template
+    """
+    return {
+        "vulns": [
+            [
+                [attribute, None if attribute in CHECKLIST_ATTRIBUTES else data]
+                for attribute, data in _stig_data(vuln)
+            ]
+            for vuln in stig.iterfind("VULN")
+        ]
+    }
+
+
+def to_delta(checklist: Checklist, store: TemplateStore) -> dict:
+    """
+    Split a checklist into a delta and templates, storing the templates.
+
+    Args:
+        checklist (Checklist): Loaded checklist
+        store (TemplateStore): Template store
+
+    Returns:
+        dict: Delta holding the XML declaration and comments before the
+            CHECKLIST element, the ASSET fields, and per STIG the template
+            digest, the STIG_INFO, the per-checklist STIG_DATA values in
+            document order and the non-STIG_DATA fields of each VULN
+    """
+    stigs = []
+    for stig in checklist.stigs:
+        vulns = list(stig.node.iterfind("VULN"))
+        fields = [] if not vulns else _fields(vulns[0])
+        rows = []
+        for vuln in vulns:
+            values = [x.text for x in vuln if x.tag != "STIG_DATA"]
+            if _fields(vuln) == fields:
+                rows.append(values)
+            else:
+                rows.append({"fields": _fields(vuln), "values": values})
+        stigs.append(
+            {
+                "template": store.put(stig_template(stig.node)),
+                "info": [
+                    [x.findtext("SID_NAME"), x.findtext("SID_DATA")]
+                    for x in stig.info.node
+                ],
+                "stig_data": [
+                    data
+                    for vuln in vulns
+                    for attribute, data in _stig_data(vuln)
+                    if attribute in CHECKLIST_ATTRIBUTES
+                ],
+                "fields": fields,
+                "vulns": rows,
+            }
+        )
+    return {
+        "format": DELTA_FORMAT,
+        "version": DELTA_VERSION,
+        "header": _source_header(checklist.file),
+        "asset": [[x.tag, x.text] for x in checklist.asset.node],
+        "stigs": stigs,
+    }
+
+
+def save_delta(
+    checklist: Checklist, output_file: Path, store: TemplateStore, force: bool = False
+):
+    """
+    Save a checklist as a delta file, storing its templates. The file is
+    JSON, compressed when the name ends in .gz, .xz or .bz2.
+
+    Args:
+        checklist (Checklist): Loaded checklist
+        output_file (Path): Path to output file
+        store (TemplateStore): Template store
+        force (bool): Whether to overwrite an existing file
+
+    Raises:
+        FileExistsError: If output file exists and force is not set
+    """
+    output_file = Path(output_file)
+    if output_file.exists() and not force:
+        raise FileExistsError(
+            f"{output_file} already exists. Pass 'force=True' to overwrite."
+        )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    data = _canonical(to_delta(checklist, store))
+    compression = SUFFIX_COMPRESSION.get(output_file.suffix.lower())
+    atomic_write(output_file, lambda fh: fh.write(data), compression)
+
+
+def load_delta(file) -> dict:
+    """
+    Read a delta file.
+
+    Args:
+        file (str): Path to delta file, or any other loader source
+
+    Returns:
+        dict: Delta
+
+    Raises:
+        ValueError: If the file is not a delta of a supported version
+    """
+    with open_source(file) as fh:
+        delta = json.load(fh)
+    if delta.get("format") != DELTA_FORMAT or delta.get("version") != DELTA_VERSION:
+        raise ValueError(f"{file} is not a version {DELTA_VERSION} checklist delta")
+    return delta
+
+
+def render(delta: dict, store: TemplateStore) -> bytes:
+    """
+    Render a delta as a STIG Viewer checklist, laid out the way STIG Viewer
+    writes it and headed by the source checklist's XML declaration and
+    comments, so an unchanged STIG Viewer checklist renders byte for byte.
+
+    Args:
+        delta (dict): Delta as returned by to_delta() or load_delta()
+        store (TemplateStore): Template store holding its templates
+
+    Returns:
+        bytes: Checklist XML
+
+    Raises:
+        KeyError: If a template is not in the store
+        ValueError: If a template does not match the delta
+    """
+    out = [delta.get("header", CKL_HEADER), "<CHECKLIST>\n\t<ASSET>\n"]
+    out.extend(_element(tag, text, 2) for tag, text in delta["asset"])
+    out.append("\t</ASSET>\n\t<STIGS>\n")
+    for stig in delta["stigs"]:
+        template = store.get(stig["template"])
+        checklist_values = sum(
+            attribute in CHECKLIST_ATTRIBUTES
+            for stig_data in template["vulns"]
+            for attribute, _ in stig_data
+        )
+        if (
+            len(template["vulns"]) != len(stig["vulns"])
+            or checklist_values != len(stig["stig_data"])
+        ):
+            raise ValueError(f"Template {stig['template']} does not match delta")
+        out.append("\t\t<iSTIG>\n\t\t\t<STIG_INFO>\n")
+        for name, data in stig["info"]:
+            out.append("\t\t\t\t<SI_DATA>\n")
+            out.append(_element("SID_NAME", name, 5))
+            if data is not None:
+                out.append(_element("SID_DATA", data, 5))
+            out.append("\t\t\t\t</SI_DATA>\n")
+        out.append("\t\t\t</STIG_INFO>\n")
+        stig_values = iter(stig["stig_data"])
+        for stig_data, row in zip(template["vulns"], stig["vulns"]):
+            out.append("\t\t\t<VULN>\n")
+            for attribute, data in stig_data:
+                if attribute in CHECKLIST_ATTRIBUTES:
+                    data = next(stig_values)
+                out.append("\t\t\t\t<STIG_DATA>\n")
+                out.append(_element("VULN_ATTRIBUTE", attribute, 5))
+                out.append(_element("ATTRIBUTE_DATA", data, 5))
+                out.append("\t\t\t\t</STIG_DATA>\n")
+            if isinstance(row, dict):
+                fields, values = row["fields"], row["values"]
+            else:
+                fields, values = stig["fields"], row
+            out.extend(_element(x, y, 4) for x, y in zip(fields, values))
+            out.append("\t\t\t</VULN>\n")
+        out.append("\t\t</iSTIG>\n")
+    out.append("\t</STIGS>\n</CHECKLIST>")
+    return "".join(out).encode("utf-8")
+
+
+def render_checklist(
+    delta: dict, store: TemplateStore, templates: StigTemplates = None
+) -> Checklist:
+    """
+    Render a delta and load it as a Checklist.
+
+    Args:
+        delta (dict): Delta as returned by to_delta() or load_delta()
+        store (TemplateStore): Template store holding its templates
+        templates (StigTemplates): Registry to share STIG data through
+
+    Returns:
+        Checklist: Loaded checklist
+    """
+    return Checklist(render(delta, store), templates=templates)
+
+
+def _source_header(file) -> str:
+    """
+    Text before the CHECKLIST element of a checklist source, or CKL_HEADER if
+    the source can no longer be read.
+    """
+    try:
+        with open_source(file) as fh:
+            head = fh.read(HEADER_READ_SIZE)
+    except (OSError, ValueError):
+        return CKL_HEADER
+    end = head.find(b"<CHECKLIST")
+    if end < 0:
+        return CKL_HEADER
+    return head[:end].decode("utf-8", errors="replace")
+
+
+def _stig_data(vuln: ET.Element) -> list[tuple[str, str]]:
+    """
+    (VULN_ATTRIBUTE, ATTRIBUTE_DATA) pairs of the STIG_DATA children of a VULN.
+    """
+    return [
+        (x.findtext("VULN_ATTRIBUTE"), x.findtext("ATTRIBUTE_DATA"))
+        for x in vuln.iterfind("STIG_DATA")
+    ]
+
+
+def _fields(vuln: ET.Element) -> list[str]:
+    """
+    Tags of the non-STIG_DATA children of a VULN.
+    """
+    return [x.tag for x in vuln if x.tag != "STIG_DATA"]
+
+
+def _element(tag: str, text: str, depth: int) -> str:
+    """
+    Serialize a text-only element on its own line.
+    """
+    indent = "\t" * depth
+    return f"{indent}<{tag}>{escape(text or '')}</{tag}>\n"
+
+
+def _canonical(data: dict) -> bytes:
+    """
+    Canonical JSON encoding used for storage and content addressing.
+    """
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
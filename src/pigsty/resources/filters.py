@@ -0,0 +1,72 @@
+"""
+Filter conventions shared by the query APIs: value and set predicates, CAT
+levels and group-by fields.
+"""
+
+VALUE_SET_TYPES: tuple = (set, frozenset, list, tuple)
+
+CATEGORY_SEVERITY: dict = {
+    "I": "high",
+    "II": "medium",
+    "III": "low",
+}
+
+
+def group_fields(group_by) -> tuple:
+    """
+    Normalize a group-by argument to a tuple of field names.
+
+    Args:
+        group_by: Field name, or iterable of field names
+
+    Returns:
+        tuple[str]: Field names
+    """
+    return (group_by,) if isinstance(group_by, str) else tuple(group_by)
+
+
+def check_fields(fields, known: tuple):
+    """
+    Raise ValueError for fields that are not known, so field names are never
+    used unchecked.
+
+    Args:
+        fields: Field names
+        known (tuple[str]): Recognized field names
+
+    Raises:
+        ValueError: If a field is not recognized
+    """
+    unknown = set(fields) - set(known)
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}. Use {known}.")
+
+
+def category_filters(category: str, filters: dict) -> dict:
+    """
+    Add the severity filter of a CAT level to query filters. Severity
+    overrides are not applied.
+
+    Args:
+        category (str): CAT level 'I', 'II' or 'III', or None
+        filters (dict): Field filters
+
+    Returns:
+        dict: Filters, with severity set when a category is given
+
+    Raises:
+        ValueError: If the category is not recognized
+    """
+    if category is not None:
+        if category not in CATEGORY_SEVERITY:
+            raise ValueError(f"Unknown category {category}. Use I, II or III.")
+        filters["severity"] = CATEGORY_SEVERITY[category]
+    return filters
+
+
+def filter_values(value) -> tuple:
+    """
+    Values a filter accepts: the members of a set, list or tuple, or the
+    single value otherwise.
+    """
+    return tuple(value) if isinstance(value, VALUE_SET_TYPES) else (value,)
@@ -0,0 +1,313 @@
+"""
+SQLite index of checklist data for queries across many checklists.
+"""
+
+import sqlite3
+
+from .checklist import iter_many
+from .filters import category_filters, check_fields, filter_values, group_fields
+from .sources import source_path
+
+SCHEMA_VERSION: int = 1
+
+QUERY_FIELDS: tuple = (
+    "path",
+    "host",
+    "ip",
+    "fqdn",
+    "stigid",
+    "version",
+    "releaseinfo",
+    "vid",
+    "severity",
+    "severity_override",
+    "status",
+)
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER,
+    mtime_ns INTEGER,
+    host TEXT,
+    ip TEXT,
+    fqdn TEXT
+);
+CREATE TABLE IF NOT EXISTS vulns (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    stigid TEXT,
+    version TEXT,
+    releaseinfo TEXT,
+    vid TEXT NOT NULL,
+    severity TEXT,
+    severity_override TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS files_host ON files (host);
+CREATE INDEX IF NOT EXISTS vulns_file ON vulns (file_id);
+CREATE INDEX IF NOT EXISTS vulns_vid_status ON vulns (vid, status);
+CREATE INDEX IF NOT EXISTS vulns_status_severity ON vulns (status, severity);
+CREATE INDEX IF NOT EXISTS vulns_severity_status ON vulns (severity, status);
+CREATE INDEX IF NOT EXISTS vulns_stigid ON vulns (stigid);
+"""
+
+
+class FleetIndex:
+    """
+    SQLite index of the asset, STIG and vulnerability data of many
+    checklists.
+
+    Checklists are summarized in parallel with iter_many() and each summary
+    is written with bulk inserts as it arrives. Updating is incremental: files whose size and modification
+    time match the index are skipped.
+
+    Args:
+        database (str): Path to SQLite database, or ':memory:'
+
+    Attributes:
+        database (str): Path to SQLite database
+        connection (sqlite3.Connection): Database connection
+
+    Methods:
+        update(self, files, workers, prune) -> dict: Index new and changed files
+        remove(self, files) -> int: Remove files from the index
+        query(self, **filters) -> list[dict]: Vulnerabilities matching filters
+        counts(self, group_by, **filters) -> dict: Counts grouped by fields
+        close(self): Close the database connection
+    """
+
+    def __init__(self, database: str):
+        self.database: str = str(database)
+        self.connection: sqlite3.Connection = sqlite3.connect(self.database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if self.database != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(
+                f"{self.database} has schema version {version}, "
+                f"expected {SCHEMA_VERSION}"
+            )
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def update(
+        self, files: list[str], workers: int = None, prune: bool = False
+    ) -> dict:
+        """
+        Index checklist files that are new or changed since they were last
+        indexed. Files are keyed by resolved path.
+
+        Args:
+            files (list[str]): Paths to checklist files or archive members
+            workers (int): Number of worker processes for iter_many()
+            prune (bool): Whether to remove indexed files not in files
+
+        Returns:
+            dict: Lists of the "indexed", "skipped" and "removed" paths, and
+                "errors" mapping paths to exceptions. Files that fail to load
+                lose their previously indexed rows and are listed under both
+                "errors" and "removed".
+        """
+        files = [source_path(x).resolve() for x in files]
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute(
+                "SELECT path, size, mtime_ns FROM files"
+            )
+        }
+        sources = {}
+        errors = {}
+        skipped = []
+        for file in files:
+            path = str(file)
+            try:
+                stat_result = file.stat()
+            except OSError as exc:
+                errors[path] = exc
+                continue
+            signature = (stat_result.st_size, stat_result.st_mtime_ns)
+            if known.get(path) == signature:
+                skipped.append(path)
+            else:
+                sources[file] = signature
+        indexed = set()
+        failures = {}
+        with self.connection:
+            for file, summary, error in iter_many(list(sources), workers=workers):
+                if error is None:
+                    self._delete([str(file)])
+                    self._insert(str(file), sources[file], summary)
+                    indexed.add(file)
+                else:
+                    failures[file] = error
+            errors.update((str(x), failures[x]) for x in sources if x in failures)
+            removed = {x for x in errors if x in known}
+            if prune:
+                removed.update(set(known) - {str(x) for x in files})
+            removed = sorted(removed)
+            self._delete(removed)
+        return {
+            "indexed": [str(x) for x in sources if x in indexed],
+            "skipped": skipped,
+            "removed": removed,
+            "errors": errors,
+        }
+
+    def remove(self, files: list[str]) -> int:
+        """
+        Remove files from the index.
+
+        Args:
+            files (list[str]): Paths to checklist files or archive members
+
+        Returns:
+            int: Number of files removed
+        """
+        with self.connection:
+            return self._delete([str(source_path(x).resolve()) for x in files])
+
+    def _delete(self, paths: list[str]) -> int:
+        """
+        Delete files and their vulnerabilities.
+        """
+        cursor = self.connection.executemany(
+            "DELETE FROM files WHERE path = ?", ((x,) for x in paths)
+        )
+        return cursor.rowcount
+
+    def _insert(self, path: str, signature: tuple, summary: dict):
+        """
+        Insert a file and the vulnerabilities of its summary.
+        """
+        asset = summary["asset"]
+        file_id = self.connection.execute(
+            "INSERT INTO files (path, size, mtime_ns, host, ip, fqdn) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                *signature,
+                asset.get("HOST_NAME"),
+                asset.get("HOST_IP"),
+                asset.get("HOST_FQDN"),
+            ),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT INTO vulns (file_id, stigid, version, releaseinfo, vid, "
+            "severity, severity_override, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    file_id,
+                    stig["info"].get("stigid"),
+                    stig["info"].get("version"),
+                    stig["info"].get("releaseinfo"),
+                    vid,
+                    vuln["severity"],
+                    vuln["severity_override"],
+                    vuln["status"],
+                )
+                for stig in summary["stigs"]
+                for vid, vuln in stig["vulnerabilities"].items()
+            ),
+        )
+
+    def query(self, category: str = None, **filters) -> list[dict]:
+        """
+        Return the vulnerabilities matching all filters.
+
+        Each filter is a field of QUERY_FIELDS and a value, or a list of
+        values any of which may match.
+
+        The category is matched on the STIG severity only; severity overrides
+        are not applied, so filter on severity_override to find them.
+
+        Args:
+            category (str): CAT level 'I', 'II' or 'III', matched on severity
+            **filters: Field filters, e.g. vid="V-257777", status="Open"
+
+        Returns:
+            list[dict]: Matching vulnerabilities with all QUERY_FIELDS
+
+        Raises:
+            ValueError: If a filter field is not recognized
+        """
+        where, params = self._where(category, filters)
+        sql = (
+            f"SELECT {', '.join(QUERY_FIELDS)} FROM vulns "
+            f"JOIN files ON files.id = vulns.file_id{where} "
+            "ORDER BY path, vid"
+        )
+        return [
+            dict(zip(QUERY_FIELDS, row))
+            for row in self.connection.execute(sql, params)
+        ]
+
+    def counts(
+        self, group_by: tuple = ("status",), category: str = None, **filters
+    ) -> dict:
+        """
+        Count the vulnerabilities matching all filters, grouped by fields.
+        As for query(), the category does not apply severity overrides.
+
+        Args:
+            group_by (tuple[str]): Fields of QUERY_FIELDS to group by
+            category (str): CAT level 'I', 'II' or 'III', matched on severity
+            **filters: Field filters, as for query()
+
+        Returns:
+            dict: Counts keyed by the group value, or by a tuple of values
+                when grouping by more than one field
+
+        Raises:
+            ValueError: If a group or filter field is not recognized
+        """
+        group_by = group_fields(group_by)
+        check_fields(group_by, QUERY_FIELDS)
+        where, params = self._where(category, filters)
+        columns = ", ".join(group_by)
+        sql = (
+            f"SELECT {columns}, COUNT(*) FROM vulns "
+            f"JOIN files ON files.id = vulns.file_id{where} GROUP BY {columns}"
+        )
+        return {
+            row[0] if len(group_by) == 1 else tuple(row[:-1]): row[-1]
+            for row in self.connection.execute(sql, params)
+        }
+
+    def _where(self, category: str, filters: dict) -> tuple[str, list]:
+        """
+        Build a WHERE clause and its parameters from query filters. None
+        matches NULL, as it matches missing values in the other query APIs.
+        """
+        filters = category_filters(category, filters)
+        check_fields(filters, QUERY_FIELDS)
+        clauses = []
+        params = []
+        for field, value in filters.items():
+            values = filter_values(value)
+            present = [x for x in values if x is not None]
+            terms = [f"{field} IS NULL"] if len(present) < len(values) else []
+            if len(present) == 1:
+                terms.append(f"{field} = ?")
+            elif present or not terms:
+                terms.append(f"{field} IN ({', '.join('?' * len(present))})")
+            clauses.append(terms[0] if len(terms) == 1 else f"({' OR '.join(terms)})")
+            params.extend(present)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self.connection.close()
+
+    def __enter__(self) -> "FleetIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -4,9 +4,12 @@ Interface to OpenSCAP XCCDF results in STIG Viewer format
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
+from .sources import open_source, source_name, source_path
+
 NS: dict = {
     "XMLSchema": "http://oval.mitre.org/XMLSchema/oval-results-5",
     "xccdf": "http://checklists.nist.gov/xccdf/1.2",
@@ -21,8 +24,19 @@ NS: dict = {
     "cdf": "http://checklists.nist.gov/xccdf/1.2",
     "xsi": "http://www.w3.org/2001/XMLSchema-instance",
     "dc": "http://purl.org/dc/elements/1.1/",
+    "ai": "http://scap.nist.gov/schema/asset-identification/1.1",
+    "core": "http://scap.nist.gov/schema/reporting-core/1.1",
+    "oval": "http://oval.mitre.org/XMLSchema/oval-common-5",
 }
 
+FACT_PREFIX: str = "urn:xccdf:fact:asset:identifier:"
+
+DATETIME_FORMAT: str = "%Y-%m-%dT%H:%M:%S%z"
+
+VID_REGEX: re.Pattern = re.compile(r"V-[0-9]+")
+
+PARSE_CACHE_SIZE: int = 4096
+
 INVALID_IPV4: set = {
     "127.0.0.1",
     "192.168.122.1",
@@ -41,6 +55,48 @@ INVALID_IPV6: set = {
 }
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_time(value: str) -> datetime:
+    """
+    Parse a rule-result time. Results share a handful of time strings, so
+    parsed values are kept in a bounded cache shared by all results.
+
+    Args:
+        value (str): Time in format '%Y-%m-%dT%H:%M:%S%z'
+
+    Returns:
+        datetime: Scan time
+    """
+    return datetime.strptime(value, DATETIME_FORMAT)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_vid(rule_id: str) -> str:
+    """
+    Extract the V-ID from a rule ID, using a bounded shared cache.
+
+    Args:
+        rule_id (str): Full rule ID
+
+    Returns:
+        str: V-ID in format 'V-[0-9]+'
+
+    Raises:
+        AttributeError: If the rule ID contains no V-ID
+    """
+    return VID_REGEX.search(rule_id).group(0)
+
+
+def parse_cache_info() -> dict:
+    """
+    Return hit and miss counters of the shared parse caches.
+
+    Returns:
+        dict: functools cache info for the "time" and "vid" caches
+    """
+    return {"time": parse_time.cache_info(), "vid": parse_vid.cache_info()}
+
+
 class OpenSCAPRuleResult:
     """
     Interface to parse and retrieve results from an OpenSCAP XCCDF result file in STIG Viewer format.
@@ -64,7 +120,6 @@ class OpenSCAPRuleResult:
         self.vid: str
         self.time: datetime
         self.result: str
-        self._datetime_format: str = "%Y-%m-%dT%H:%M:%S%z"
         self.node = result_node
 
     @property
@@ -73,11 +128,11 @@ class OpenSCAPRuleResult:
 
     @property
     def vid(self) -> str:
-        return re.search(r"V-[0-9]+", self.rule_id).group(0)
+        return parse_vid(self.rule_id)
 
     @property
     def time(self) -> datetime:
-        return datetime.strptime(self.node.get("time"), self._datetime_format)
+        return parse_time(self.node.get("time"))
 
     @property
     def severity(self) -> str:
@@ -89,7 +144,7 @@ class OpenSCAPRuleResult:
 
     @property
     def result(self) -> str:
-        return self.node.get("result")
+        return self.node.findtext("xccdf:result", namespaces=NS)
 
     def as_dict(self) -> dict:
         """
@@ -97,29 +152,25 @@ class OpenSCAPRuleResult:
         """
         ident = self.node.find("xccdf:ident", NS)
         check = self.node.find("xccdf:check", NS)
-        if check:
-            check_export: list = self.node.findall("xccdf:check-export")
-            check_content_ref = self.node.find("xccdf:check-content-ref", NS)
-            check_data: dict = (
-                {
-                    "system": check.get("system"),
-                    "check_content_ref": {
-                        "name": check_content_ref.get("name"),
-                        "href": check_content_ref.get("href"),
-                    }
-                    if check_content_ref
-                    else None,
-                    "check_export": [
-                        {
-                            "export_name": x.get("export_name"),
-                            "href": x.get("href"),
-                        }
-                        for x in check_export
-                    ],
+        check_data: dict = None
+        if check is not None:
+            check_content_ref = check.find("xccdf:check-content-ref", NS)
+            check_data = {
+                "system": check.get("system"),
+                "check_content_ref": {
+                    "name": check_content_ref.get("name"),
+                    "href": check_content_ref.get("href"),
                 }
-                if check
+                if check_content_ref is not None
                 else None,
-            )
+                "check_export": [
+                    {
+                        "export_name": x.get("export-name"),
+                        "value_id": x.get("value-id"),
+                    }
+                    for x in check.findall("xccdf:check-export", NS)
+                ],
+            }
 
         return {
             "rule_id": self.rule_id,
@@ -128,24 +179,105 @@ class OpenSCAPRuleResult:
             "severity": self.severity,
             "weight": self.weight,
             "result": self.result,
-            "ident": {"system": ident.get("system"), "text": ident.text},
-            "check": check_data if check else None,
+            "ident": {"system": ident.get("system"), "text": ident.text}
+            if ident is not None
+            else None,
+            "check": check_data,
         }
 
 
+class OpenSCAPRuleRecord:
+    """
+    Compact rule result holding plain values in slots instead of an
+    ElementTree node, with the V-ID and scan time parsed once.
+
+    Args:
+        rule_id (str): Full rule ID
+        vid (str): V-ID in format 'V-[0-9]+'
+        time (datetime): Scan time
+        severity (str): Severity rating
+        weight (str): Numeric weight of check
+        result (str): Result of check
+        ident (dict): Identifier system and text
+        check (dict): Check system, content reference and exports
+    """
+
+    __slots__ = (
+        "rule_id",
+        "vid",
+        "time",
+        "severity",
+        "weight",
+        "result",
+        "ident",
+        "check",
+    )
+
+    def __init__(
+        self,
+        rule_id: str,
+        vid: str,
+        time: datetime,
+        severity: str,
+        weight: str,
+        result: str,
+        ident: dict = None,
+        check: dict = None,
+    ):
+        self.rule_id: str = rule_id
+        self.vid: str = vid
+        self.time: datetime = time
+        self.severity: str = severity
+        self.weight: str = weight
+        self.result: str = result
+        self.ident: dict = ident
+        self.check: dict = check
+
+    @classmethod
+    def from_element(cls, result_node: ET.Element) -> "OpenSCAPRuleRecord":
+        """
+        Build a record from a rule-result element.
+
+        Args:
+            result_node (ET.Element): rule-result element
+
+        Returns:
+            OpenSCAPRuleRecord: Rule result record
+        """
+        return cls(**OpenSCAPRuleResult(result_node).as_dict())
+
+    def as_dict(self) -> dict:
+        """
+        Returns a dictionary representation of the OpenSCAPRuleRecord object
+        """
+        return {x: getattr(self, x) for x in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, OpenSCAPRuleRecord):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"OpenSCAPRuleRecord({self.rule_id!r}, result={self.result!r})"
+
+
 class OpenSCAPSTIGViewerResult:
     """
     Interface to parse and retrieve results from an OpenSCAP XCCDF result file in STIG Viewer format.
 
     Args:
-        file (str): Path to XCCDF file
+        file (str): Path to XCCDF file, or an archive member, bytes-like
+            object or binary file object holding one
         autoload (bool): Whether to load the data immediately
+        compact (bool): Whether to load rule results as OpenSCAPRuleRecord
+            objects and release the element tree after loading
 
     Attributes:
-        file (Path): Path to XCCDF file
-        tree (ET.ElementTree): ElementTree object
-        root (ET.Element): Root element
-        rule_results (Dict[str, OpenSCAPRuleResult]): Dictionary of OpenSCAPRuleResult objects
+        file (Path): Path to XCCDF file, or the non-path source
+        tree (ET.ElementTree): ElementTree object, None after a compact load
+        root (ET.Element): Root element, None after a compact load
+        rule_results (Dict[str, OpenSCAPRuleResult]): Dictionary of OpenSCAPRuleResult objects,
+            or OpenSCAPRuleRecord objects after a compact load
 
     Properties:
         target (str): Target name
@@ -154,94 +286,212 @@ class OpenSCAPSTIGViewerResult:
         fqdn (Set[str]): Values FQDN target-facts
     """
 
-    def __init__(self, file: str, autoload: bool = True):
+    def __init__(self, file: str, autoload: bool = True, compact: bool = False):
         self.tree: ET.ElementTree = None
         self.root: ET.Element = None
         self.rule_results: dict[str, OpenSCAPRuleResult] = {}
-        self.file: Path = Path(file)
+        self.file: Path = source_path(file)
+        self.compact: bool = compact
+        self._target_info: dict = None
         if autoload:
             self.load()
 
-    def load(self):
+    def load(self, file=None):
         """
         Load checklist XML data from file.
+
+        Args:
+            file: Source to load instead of the current one
         """
+        if file is not None:
+            self.file = source_path(file)
         self._parse()
+        self._load_parsed()
+
+    @classmethod
+    def from_element(
+        cls, root: ET.Element, file: str = "", compact: bool = False
+    ) -> "OpenSCAPSTIGViewerResult":
+        """
+        Create a result from an already parsed TestResult, or an element
+        containing one.
+
+        Args:
+            root (ET.Element): Root element
+            file (str): Path to the file the element was read from
+            compact (bool): Whether to load rule results as OpenSCAPRuleRecord
+                objects and release the element tree
+
+        Returns:
+            OpenSCAPSTIGViewerResult: Loaded result
+        """
+        result = cls(file, autoload=False, compact=compact)
+        result.tree = ET.ElementTree(root)
+        result.root = root
+        result._load_parsed()
+        return result
+
+    def _load_parsed(self):
+        """
+        Load rule results from the parsed tree, replacing any loaded before.
+        """
+        self.rule_results = {}
+        self._target_info = None
         self._load_rule_results()
+        if self.compact:
+            self._target()
+            self.tree = None
+            self.root = None
+
+    def summary(self) -> dict:
+        """
+        Return a compact, picklable summary of the target facts and rule
+        results.
+
+        Returns:
+            dict: Result summary
+        """
+        return {
+            "file": source_name(self.file),
+            "target": self.target,
+            "identity": self.identity,
+            "target_addresses": self.target_addresses,
+            "ipv4": self.ipv4,
+            "ipv6": self.ipv6,
+            "mac": self.mac,
+            "hostname": self.hostname,
+            "fqdn": self.fqdn,
+            "platform": self.platform,
+            "set_value": self.set_value,
+            "rule_results": {
+                vid: {
+                    "rule_id": x.rule_id,
+                    "time": x.time,
+                    "severity": x.severity,
+                    "weight": x.weight,
+                    "result": x.result,
+                }
+                for vid, x in self.rule_results.items()
+            },
+        }
+
+    def iter_rule_results(self):
+        """
+        Stream rule results from the file with an incremental parser.
+
+        Each rule-result is released once the caller advances the iterator,
+        and every element outside the TestResult is released as soon as it
+        has been parsed, so memory use follows the number of results rather
+        than the file size. Target facts are captured as they are passed and
+        the target properties can be read during or after iteration. The
+        tree, root and rule_results attributes are not populated.
+
+        Yields:
+            OpenSCAPRuleRecord: Rule result record
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+        """
+        test_result_tag = f"{{{NS['xccdf']}}}TestResult"
+        rule_result_tag = f"{{{NS['xccdf']}}}rule-result"
+        stack: list[ET.Element] = []
+        test_result: ET.Element = None
+        self._target_info = None
+        with open_source(self.file) as fh:
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem)
+                    if elem.tag == test_result_tag:
+                        test_result = elem
+                    continue
+                stack.pop()
+                if elem.tag == rule_result_tag:
+                    if self._target_info is None:
+                        self._target_info = _extract_target(test_result)
+                    yield OpenSCAPRuleRecord.from_element(elem)
+                elif elem.tag == test_result_tag:
+                    self._target_info = _extract_target(elem)
+                    test_result = None
+                elif test_result is not None:
+                    continue
+                if stack:
+                    elem.clear()
+                    stack[-1].remove(elem)
 
     def _parse(self):
         """
         Parse XML.
         """
-        self.tree = ET.parse(self.file)
+        with open_source(self.file) as fh:
+            self.tree = ET.parse(fh)
         self.root = self.tree.getroot()
 
     def _load_rule_results(self):
         """
-        Load the rule results as OpenSCAPRuleResult objects in the rule_results dictionary.
+        Load the rule results as OpenSCAPRuleResult objects in the rule_results dictionary,
+        or as OpenSCAPRuleRecord objects for a compact load.
         """
-        vid_regex = r"V-[0-9]+"
         rule_results = self.root.findall(".//xccdf:rule-result", NS)
         for result in rule_results:
-            rule_id = result.get("idref")
-            vid = re.search(vid_regex, rule_id).group(0)
+            if self.compact:
+                record = OpenSCAPRuleRecord.from_element(result)
+                self.rule_results.update({record.vid: record})
+                continue
+            vid = parse_vid(result.get("idref"))
             self.rule_results.update({vid: OpenSCAPRuleResult(result)})
 
+    def _target(self) -> dict:
+        """
+        Return the target facts, addresses, platforms and set-values of the
+        TestResult, collected in a single pass over its children on first use.
+        """
+        if self._target_info is None:
+            test_result = self.root
+            if test_result.tag != f"{{{NS['xccdf']}}}TestResult":
+                test_result = self.root.find(".//xccdf:TestResult", NS)
+            self._target_info = _extract_target(test_result)
+        return self._target_info
+
     @property
     def target(self) -> str:
-        return self.root.find(".//xccdf:target", NS).text
+        return self._target()["target"]
 
     @property
     def identity(self) -> str:
-        return self.root.find(".//xccdf:identity", NS).text
+        return self._target()["identity"]
 
     @property
     def target_addresses(self) -> set[str]:
         all_invalid = INVALID_IPV4.union(INVALID_IPV6, INVALID_HOSTNAME, INVALID_MAC)
-        return {
-            x.text
-            for x in self.root.findall(".//xccdf:target-address", NS)
-            if x.text not in all_invalid
-        }
+        return {x for x in self._target()["target_addresses"] if x not in all_invalid}
+
+    def _facts(self, name: str, invalid: set = frozenset()) -> set[str]:
+        facts = self._target()["facts"].get(f"{FACT_PREFIX}{name}", [])
+        return {x for x in facts if x not in invalid}
 
     @property
     def ipv4(self) -> set[str]:
-        query = './/xccdf:target-facts/xccdf:fact[@name="urn:xccdf:fact:asset:identifier:ipv4"]'
-        return {
-            x.text for x in self.root.findall(query, NS) if x.text not in INVALID_IPV4
-        }
+        return self._facts("ipv4", INVALID_IPV4)
 
     @property
     def ipv6(self) -> set[str]:
-        query = './/xccdf:target-facts/xccdffact[@name="urn:xccdf:fact:asset:identifier:ipv6"]'
-        return {
-            x.text for x in self.root.findall(query, NS) if x.text not in INVALID_IPV6
-        }
+        return self._facts("ipv6", INVALID_IPV6)
 
     @property
     def mac(self) -> set[str]:
-        query = './/xccdf:target-facts/xccdf:fact[@name="urn:xccdf:fact:asset:identifier:mac"]'
-        return {
-            x.text for x in self.root.findall(query, NS) if x.text not in INVALID_MAC
-        }
+        return self._facts("mac", INVALID_MAC)
 
     @property
     def hostname(self) -> set[str]:
-        query = './/xccdf:target-facts/xccdf:fact[@name="urn:xccdf:fact:asset:identifier:host_name"]'
-        return {
-            x.text
-            for x in self.root.findall(query, NS)
-            if x.text not in INVALID_HOSTNAME
-        }
+        return self._facts("host_name", INVALID_HOSTNAME)
 
     @property
     def fqdn(self) -> set[str]:
-        query = './/xccdf:target-facts/xccdf:fact[@name="urn:xccdf:fact:asset:identifier:fqdn"]'
-        return {x.text for x in self.root.findall(query, NS)}
+        return self._facts("fqdn")
 
     @property
     def platform(self) -> set[str]:
-        return {x.get("idref") for x in self.root.findall(".//xccdf:platform", NS)}
+        return set(self._target()["platform"])
 
     @property
     def cpe(self) -> set[str]:
@@ -249,6 +499,44 @@ class OpenSCAPSTIGViewerResult:
 
     @property
     def set_value(self) -> dict[str, str]:
-        return {
-            x.get("idref"): x.text for x in self.root.findall(".//xccdf:set-value", NS)
-        }
+        return dict(self._target()["set_value"])
+
+
+def _extract_target(test_result: ET.Element) -> dict:
+    """
+    Collect target, identity, target-address, target-facts, platform and
+    set-value data from the direct children of a TestResult element.
+
+    Args:
+        test_result (ET.Element): TestResult element
+
+    Returns:
+        dict: Target information
+    """
+    xccdf = f"{{{NS['xccdf']}}}"
+    info = {
+        "target": None,
+        "identity": None,
+        "target_addresses": [],
+        "facts": {},
+        "platform": [],
+        "set_value": {},
+    }
+    if test_result is None:
+        return info
+    for child in test_result:
+        tag = child.tag
+        if tag == f"{xccdf}target":
+            info["target"] = child.text
+        elif tag == f"{xccdf}identity":
+            info["identity"] = child.text
+        elif tag == f"{xccdf}target-address":
+            info["target_addresses"].append(child.text)
+        elif tag == f"{xccdf}target-facts":
+            for fact in child:
+                info["facts"].setdefault(fact.get("name"), []).append(fact.text)
+        elif tag == f"{xccdf}platform":
+            info["platform"].append(child.get("idref"))
+        elif tag == f"{xccdf}set-value":
+            info["set_value"][child.get("idref")] = child.text
+    return info
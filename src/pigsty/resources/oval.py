@@ -0,0 +1,358 @@
+"""
+Interface to OVAL definitions and OVAL results produced by OpenSCAP.
+"""
+
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from .openscap import NS
+from .sources import open_source, source_path
+
+DEFINITIONS: str = f"{{{NS['oval-definitions']}}}"
+RESULTS: str = f"{{{NS['XMLSchema']}}}"
+CHARACTERISTICS: str = f"{{{NS['oval-characteristics']}}}"
+
+DEFINITION_SECTIONS: dict = {
+    f"{DEFINITIONS}definitions": "definitions",
+    f"{DEFINITIONS}tests": "tests",
+    f"{DEFINITIONS}objects": "objects",
+    f"{DEFINITIONS}states": "states",
+    f"{DEFINITIONS}variables": "variables",
+}
+
+
+class OVALResults:
+    """
+    Interface to OVAL results with id-keyed indexes, so a failing definition
+    can be followed to its tests, objects, states, variables and collected
+    items with constant-time lookups.
+
+    Also accepts a plain oval_definitions document, in which case the result
+    and system characteristics indexes are empty.
+
+    Args:
+        file (str): Path to OVAL results file
+        autoload (bool): Whether to load the data immediately
+
+    Attributes:
+        file (Path): Path to OVAL results file
+        tree (ET.ElementTree): ElementTree object
+        root (ET.Element): Root element
+        definitions (dict[str, ET.Element]): Definitions by id
+        tests (dict[str, ET.Element]): Tests by id
+        objects (dict[str, ET.Element]): Objects by id
+        states (dict[str, ET.Element]): States by id
+        variables (dict[str, ET.Element]): Variables by id
+        definition_results (dict[str, ET.Element]): Definition results by definition id
+        test_results (dict[str, ET.Element]): Test results by test id
+        collected_objects (dict[str, ET.Element]): Collected objects by object id
+        items (dict[str, ET.Element]): System characteristics items by id
+
+    Methods:
+        load(self): Load OVAL XML data from file
+        result(self, definition_id) -> str: Result of a definition
+        explain(self, definition_id) -> dict: Resolve a definition to its evidence
+        explain_rule(self, rule) -> dict: Resolve a rule result's OVAL check
+    """
+
+    def __init__(self, file: str, autoload: bool = True):
+        self.tree: ET.ElementTree = None
+        self.root: ET.Element = None
+        self.file: Path = source_path(file)
+        self._reset()
+        if autoload:
+            self.load()
+
+    @classmethod
+    def from_element(cls, root: ET.Element, file: str = "") -> "OVALResults":
+        """
+        Create an index from an already parsed oval_results or
+        oval_definitions element.
+
+        Args:
+            root (ET.Element): Root element
+            file (str): Path to the file the element was read from
+
+        Returns:
+            OVALResults: Indexed results
+        """
+        results = cls(file, autoload=False)
+        results.tree = ET.ElementTree(root)
+        results.root = root
+        results._index()
+        return results
+
+    def load(self):
+        """
+        Load OVAL XML data from file.
+        """
+        with open_source(self.file) as fh:
+            self.tree = ET.parse(fh)
+        self.root = self.tree.getroot()
+        self._index()
+
+    def _reset(self):
+        self.definitions: dict[str, ET.Element] = {}
+        self.tests: dict[str, ET.Element] = {}
+        self.objects: dict[str, ET.Element] = {}
+        self.states: dict[str, ET.Element] = {}
+        self.variables: dict[str, ET.Element] = {}
+        self.definition_results: dict[str, ET.Element] = {}
+        self.test_results: dict[str, ET.Element] = {}
+        self.collected_objects: dict[str, ET.Element] = {}
+        self.items: dict[str, ET.Element] = {}
+
+    def _index(self):
+        """
+        Build all id indexes in a single pass over the document.
+        """
+        self._reset()
+        for elem in self.root.iter():
+            tag = elem.tag
+            if tag in DEFINITION_SECTIONS:
+                index = getattr(self, DEFINITION_SECTIONS[tag])
+                for child in elem:
+                    index[child.get("id")] = child
+            elif tag == f"{RESULTS}definition":
+                self.definition_results[elem.get("definition_id")] = elem
+            elif tag == f"{RESULTS}test":
+                self.test_results[elem.get("test_id")] = elem
+            elif tag == f"{CHARACTERISTICS}collected_objects":
+                for child in elem:
+                    self.collected_objects[child.get("id")] = child
+            elif tag == f"{CHARACTERISTICS}system_data":
+                for child in elem:
+                    self.items[child.get("id")] = child
+
+    def result(self, definition_id: str) -> str:
+        """
+        Result of a definition.
+
+        Args:
+            definition_id (str): Definition id
+
+        Returns:
+            str: Result (true, false, error, ...), or None if not evaluated
+        """
+        result = self.definition_results.get(definition_id)
+        return None if result is None else result.get("result")
+
+    def explain_rule(self, rule: dict) -> dict:
+        """
+        Resolve the OVAL check of a rule result.
+
+        Args:
+            rule (dict): Rule result as returned by OpenSCAPRuleResult.as_dict()
+
+        Returns:
+            dict: Definition explanation, or None if the rule has no OVAL check
+        """
+        check = rule.get("check") or {}
+        ref = check.get("check_content_ref") or {}
+        if check.get("system") != NS["oval-definitions"] or not ref.get("name"):
+            return None
+        return self.explain(ref["name"])
+
+    def explain(self, definition_id: str, _seen: set = None) -> dict:
+        """
+        Resolve a definition to its criteria, tests, objects, states and
+        collected items.
+
+        Args:
+            definition_id (str): Definition id
+
+        Returns:
+            dict: Definition explanation
+
+        Raises:
+            KeyError: If the definition is not found
+        """
+        seen = set() if _seen is None else _seen
+        seen.add(definition_id)
+        definition = self.definitions.get(definition_id)
+        result = self.definition_results.get(definition_id)
+        if definition is None and result is None:
+            raise KeyError(f"{definition_id} not found")
+        criteria = None
+        if definition is not None:
+            criteria = definition.find(f"{DEFINITIONS}criteria")
+        result_criteria = None if result is None else result.find(f"{RESULTS}criteria")
+        return {
+            "id": definition_id,
+            "class": None if definition is None else definition.get("class"),
+            "title": None
+            if definition is None
+            else definition.findtext(f"{DEFINITIONS}metadata/{DEFINITIONS}title"),
+            "result": self.result(definition_id),
+            "criteria": self._criteria(criteria, result_criteria, seen),
+        }
+
+    def _criteria(self, criteria: ET.Element, results: ET.Element, seen: set) -> dict:
+        """
+        Resolve a criteria element, walking the definition and its result in
+        parallel.
+        """
+        if criteria is None and results is None:
+            return None
+        node = criteria if criteria is not None else results
+        children = []
+        result_children = list(results) if results is not None else []
+        for index, child in enumerate(node):
+            result_child = None
+            if index < len(result_children):
+                result_child = result_children[index]
+            local = child.tag.rpartition("}")[2]
+            result = None if result_child is None else result_child.get("result")
+            if local == "criteria":
+                children.append(self._criteria(child, result_child, seen))
+            elif local == "criterion":
+                test_id = child.get("test_ref")
+                children.append(
+                    {
+                        "criterion": test_id,
+                        "comment": child.get("comment"),
+                        "negate": child.get("negate") == "true",
+                        "result": result,
+                        "test": self.test(test_id),
+                    }
+                )
+            elif local == "extend_definition":
+                definition_id = child.get("definition_ref")
+                children.append(
+                    {
+                        "extend_definition": definition_id,
+                        "comment": child.get("comment"),
+                        "negate": child.get("negate") == "true",
+                        "result": result,
+                        "definition": None
+                        if definition_id in seen
+                        else self.explain(definition_id, seen),
+                    }
+                )
+        return {
+            "operator": node.get("operator", "AND"),
+            "negate": node.get("negate") == "true",
+            "result": None if results is None else results.get("result"),
+            "children": children,
+        }
+
+    def test(self, test_id: str) -> dict:
+        """
+        Resolve a test to its object, states, result and tested items.
+
+        Args:
+            test_id (str): Test id
+
+        Returns:
+            dict: Test explanation
+        """
+        test = self.tests.get(test_id)
+        result = self.test_results.get(test_id)
+        object_id = None
+        state_ids = []
+        if test is not None:
+            for child in test:
+                if child.get("object_ref"):
+                    object_id = child.get("object_ref")
+                elif child.get("state_ref"):
+                    state_ids.append(child.get("state_ref"))
+        tested_items = []
+        tested_variables = {}
+        if result is not None:
+            for child in result:
+                if child.tag == f"{RESULTS}tested_item":
+                    tested_items.append(
+                        {"item_id": child.get("item_id"), "result": child.get("result")}
+                    )
+                elif child.tag == f"{RESULTS}tested_variable":
+                    tested_variables[child.get("variable_id")] = child.text
+        return {
+            "id": test_id,
+            "type": None if test is None else test.tag.rpartition("}")[2],
+            "comment": None if test is None else test.get("comment"),
+            "check": None if result is None else result.get("check"),
+            "check_existence": None
+            if result is None
+            else result.get("check_existence"),
+            "result": None if result is None else result.get("result"),
+            "object": self.object(object_id) if object_id else None,
+            "states": [self.state(x) for x in state_ids],
+            "tested_items": tested_items,
+            "tested_variables": tested_variables,
+        }
+
+    def object(self, object_id: str) -> dict:
+        """
+        Resolve an object to its collection flag and collected items.
+
+        Args:
+            object_id (str): Object id
+
+        Returns:
+            dict: Object explanation
+        """
+        collected = self.collected_objects.get(object_id)
+        item_ids = (
+            []
+            if collected is None
+            else [
+                x.get("item_ref")
+                for x in collected.iterfind(f"{CHARACTERISTICS}reference")
+            ]
+        )
+        return {
+            "id": object_id,
+            "flag": None if collected is None else collected.get("flag"),
+            "items": [self.item(x) for x in item_ids],
+        }
+
+    def state(self, state_id: str) -> dict:
+        """
+        Return a state as a dictionary.
+
+        Args:
+            state_id (str): State id
+
+        Returns:
+            dict: State type, comment, operator and entities, each with its
+                name, value and attributes such as operation and var_ref
+        """
+        state = self.states.get(state_id)
+        if state is None:
+            return {
+                "id": state_id,
+                "type": None,
+                "comment": None,
+                "operator": None,
+                "entities": [],
+            }
+        return {
+            "id": state_id,
+            "type": state.tag.rpartition("}")[2],
+            "comment": state.get("comment"),
+            "operator": state.get("operator", "AND"),
+            "entities": [
+                {"name": x.tag.rpartition("}")[2], "value": x.text, **x.attrib}
+                for x in state
+            ],
+        }
+
+    def item(self, item_id: str) -> dict:
+        """
+        Return a collected item as a dictionary.
+
+        Args:
+            item_id (str): Item id
+
+        Returns:
+            dict: Item type, status and values
+        """
+        item = self.items.get(item_id)
+        if item is None:
+            return {"id": item_id, "type": None, "status": None, "values": {}}
+        return {
+            "id": item_id,
+            "type": item.tag.rpartition("}")[2],
+            "status": item.get("status"),
+            "values": {x.tag.rpartition("}")[2]: x.text for x in item},
+        }
@@ -0,0 +1,345 @@
+"""
+Helpers shared by the resource modules: opening the sources accepted by the
+loaders (paths on disk, members of ZIP archives, in-memory buffers and binary
+file objects, any of which may be gzip, xz or bzip2 compressed), writing
+files atomically, and reporting parse errors.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import stat
+import uuid
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.parsers import expat
+
+from .archive import ArchiveMember
+
+READ_BUFFER_SIZE: int = 2**20
+
+WRITE_BUFFER_SIZE: int = 2**20
+
+COMPRESSION_MAGIC: dict = {
+    b"\x1f\x8b": "gzip",
+    b"\xfd7zXZ\x00": "xz",
+    b"BZh": "bz2",
+}
+
+SUFFIX_COMPRESSION: dict = {
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".bz2": "bz2",
+}
+
+COMPRESSORS: dict = {
+    "gzip": lambda fh, mode: gzip.GzipFile(fileobj=fh, mode=mode, filename=""),
+    "xz": lambda fh, mode: lzma.LZMAFile(fh, mode=mode),
+    "bz2": lambda fh, mode: bz2.BZ2File(fh, mode=mode),
+}
+
+
+BUFFER_TYPES: tuple = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+class _MemoryReader(io.RawIOBase):
+    """
+    Seekable reader over a bytes-like object. Reads are sliced from a
+    memoryview of the buffer, so the buffer itself is never copied.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else start + size
+        data = bytes(self._view[start:end])
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self._view[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class StreamSource:
+    """
+    A caller's binary file object used as a loader source. The position of
+    the object when it was passed in is kept, so seekable objects can be
+    read again from the same point; other objects can be read once.
+
+    Args:
+        fh: Binary file object
+
+    Attributes:
+        fh: Binary file object
+        start (int): Position of the object when it was passed in
+    """
+
+    __slots__ = ("fh", "start")
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.start: int = fh.tell() if _seekable(fh) else 0
+
+    def open(self):
+        """
+        Open the object for reading from its start position. Closing the
+        returned reader leaves the object open.
+
+        Returns:
+            io.BufferedReader: Buffered reader
+        """
+        return io.BufferedReader(_BorrowedReader(self.fh, self.start))
+
+    def __str__(self) -> str:
+        name = getattr(self.fh, "name", None)
+        return str(name) if isinstance(name, (str, os.PathLike)) else "<stream>"
+
+
+class _BorrowedReader(io.RawIOBase):
+    """
+    Raw reader over a caller's binary file object. Positions are relative to
+    the start position, and closing the reader leaves the object open.
+    """
+
+    def __init__(self, fh, start: int = 0):
+        self._fh = fh
+        self._start = start
+        if _seekable(fh):
+            fh.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return _seekable(self._fh)
+
+    def readinto(self, buffer) -> int:
+        if hasattr(self._fh, "readinto"):
+            return self._fh.readinto(buffer)
+        data = self._fh.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            offset += self._start
+        return self._fh.seek(offset, whence) - self._start
+
+    def tell(self) -> int:
+        return self._fh.tell() - self._start
+
+
+def _seekable(fh) -> bool:
+    """
+    Whether a caller's file object can seek. Objects with only read() are
+    read once from their current position.
+    """
+    return getattr(fh, "seekable", lambda: False)()
+
+
+class _DecompressedReader(io.BufferedReader):
+    """
+    Buffered reader over a decompressing stream that also closes the
+    underlying source file when it is closed.
+    """
+
+    def __init__(self, stream, source, compression: str):
+        super().__init__(stream, buffer_size=READ_BUFFER_SIZE)
+        self.source = source
+        self.compression: str = compression
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.source.close()
+
+
+def source_path(file):
+    """
+    Normalize a loader source.
+
+    Args:
+        file: Path, archive member, bytes-like object or binary file object
+
+    Returns:
+        Path for anything path-like, otherwise the source unchanged
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return Path(file)
+    if isinstance(file, BUFFER_TYPES + (ArchiveMember,)):
+        return file
+    if hasattr(file, "read"):
+        return StreamSource(file)
+    return file
+
+
+def source_name(file) -> str:
+    """
+    Display name of a loader source.
+
+    Args:
+        file: Path, archive member, bytes-like object or binary file object
+
+    Returns:
+        str: Path, the name of a file object, or '<memory>' for buffers
+    """
+    if isinstance(file, BUFFER_TYPES):
+        return "<memory>"
+    return str(source_path(file))
+
+
+def open_source(file):
+    """
+    Open a loader source for binary reading. Compressed content is detected
+    from its first bytes and decompressed as it is read, so parsers stream
+    straight from the compressed file.
+
+    Bytes-like objects are read in place through a memoryview, and binary
+    file objects are read from the position they had when first passed to a
+    loader and are left open.
+
+    Args:
+        file: Path, archive member, bytes-like object or binary file object
+
+    Returns:
+        Binary file object
+    """
+    fh = _open_raw(file)
+    compression = sniff_compression(fh)
+    if compression is None:
+        return fh
+    return _DecompressedReader(COMPRESSORS[compression](fh, "rb"), fh, compression)
+
+
+def sniff_compression(fh) -> str:
+    """
+    Detect the compression of a binary file object from its magic bytes
+    without consuming them.
+
+    Args:
+        fh: Binary file object with peek() or seek()
+
+    Returns:
+        str: 'gzip', 'xz' or 'bz2', or None for uncompressed content
+    """
+    if hasattr(fh, "peek"):
+        head = fh.peek(6)[:6]
+    else:
+        position = fh.tell()
+        head = fh.read(6)
+        fh.seek(position)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def source_compression(file) -> str:
+    """
+    Detect the compression of a loader source.
+
+    Args:
+        file: Path, archive member, bytes-like object or binary file object
+
+    Returns:
+        str: 'gzip', 'xz' or 'bz2', or None for uncompressed content
+    """
+    with _open_raw(file) as fh:
+        return sniff_compression(fh)
+
+
+def _open_raw(file):
+    """
+    Open a loader source for binary reading without decompressing it.
+    """
+    file = source_path(file)
+    if isinstance(file, (ArchiveMember, StreamSource)):
+        return file.open()
+    if isinstance(file, BUFFER_TYPES):
+        return _MemoryReader(file)
+    return open(file, "rb")
+
+
+def atomic_write(output_file: Path, write, compression: str = None):
+    """
+    Write a file atomically: call write() with a buffered binary file object
+    for a temporary file beside output_file, fsync it, and replace
+    output_file with it. The existing file's permissions are kept.
+
+    Args:
+        output_file (Path): Path to output file
+        write: Callable taking the binary file object to write to
+        compression (str): 'gzip', 'xz' or 'bz2', or None to write plainly
+    """
+    tmp = output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        if output_file.exists():
+            os.chmod(tmp, stat.S_IMODE(output_file.stat().st_mode))
+        with open(fd, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            if compression is None:
+                write(fh)
+            else:
+                with COMPRESSORS[compression](fh, "wb") as stream:
+                    write(stream)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, output_file)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(output_file.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def parse_error(exc: expat.ExpatError) -> ET.ParseError:
+    """
+    Convert an expat error into the ParseError that ElementTree raises, so
+    loaders parsing with expat directly report errors the same way.
+
+    Args:
+        exc (expat.ExpatError): Expat error
+
+    Returns:
+        ET.ParseError: Error with the same message, code and position
+    """
+    error = ET.ParseError(str(exc))
+    error.code = exc.code
+    error.position = (exc.lineno, exc.offset)
+    return error
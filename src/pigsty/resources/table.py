@@ -0,0 +1,316 @@
+"""
+Columnar, dictionary-encoded table of vulnerability status across many
+checklists.
+"""
+
+import csv
+import io
+import json
+from array import array
+from collections import Counter
+from itertools import compress
+from pathlib import Path
+
+from .checklist import Checklist, iter_many
+from .filters import category_filters, check_fields, filter_values, group_fields
+from .sources import SUFFIX_COMPRESSION, atomic_write
+
+TABLE_COLUMNS: tuple = (
+    "file",
+    "host",
+    "target_key",
+    "stigid",
+    "vid",
+    "severity",
+    "severity_override",
+    "status",
+)
+
+CODE_TYPES: tuple = (
+    ("B", 2**8),
+    ("H", 2**16),
+    ("I", 2**32),
+)
+
+
+class VulnTable:
+    """
+    Columnar table of the vulnerabilities of many checklists, one row per
+    vulnerability per STIG per checklist.
+
+    Each column is an array of integer codes into a dictionary of the
+    column's distinct values, so a repeated string is stored once however
+    many rows hold it. Codes start as single bytes and are widened when a
+    column's dictionary outgrows them. Filters and group-by counts work on
+    the codes and decode only the values they return.
+
+    Attributes:
+        columns (tuple[str]): Column names, TABLE_COLUMNS
+
+    Methods:
+        add_checklist(self, checklist): Append the rows of a checklist
+        add_summary(self, summary): Append the rows of a checklist summary
+        add_files(self, files, workers) -> dict: Append the rows of many files
+        column(self, name) -> list: Decoded values of a column
+        filter(self, **predicates) -> VulnTable: Rows matching predicates
+        counts(self, group_by, **predicates) -> dict: Counts grouped by columns
+        rows(self): Iterate over rows as dictionaries
+        to_csv(self, output_file, force): Write the table as CSV
+        to_jsonl(self, output_file, force): Write the table as JSON lines
+    """
+
+    def __init__(self):
+        self.columns: tuple[str] = TABLE_COLUMNS
+        self._codes: dict[str, array] = {
+            x: array(CODE_TYPES[0][0]) for x in TABLE_COLUMNS
+        }
+        self._values: dict[str, list] = {x: [] for x in TABLE_COLUMNS}
+        self._lookup: dict[str, dict] = {x: {} for x in TABLE_COLUMNS}
+
+    def add_checklist(self, checklist: Checklist):
+        """
+        Append the rows of a loaded checklist.
+
+        Args:
+            checklist (Checklist): Loaded checklist
+        """
+        self.add_summary(checklist.summary())
+
+    def add_summary(self, summary: dict):
+        """
+        Append the rows of a checklist summary.
+
+        Args:
+            summary (dict): Summary as returned by Checklist.summary(),
+                load_many() or iter_many()
+        """
+        asset = summary["asset"]
+        file = self._encode("file", summary.get("file"))
+        host = self._encode("host", asset.get("HOST_NAME"))
+        target_key = self._encode("target_key", asset.get("TARGET_KEY"))
+        for stig in summary["stigs"]:
+            vulns = stig["vulnerabilities"]
+            count = len(vulns)
+            stigid = self._encode("stigid", stig["info"].get("stigid"))
+            self._codes["file"].extend([file] * count)
+            self._codes["host"].extend([host] * count)
+            self._codes["target_key"].extend([target_key] * count)
+            self._codes["stigid"].extend([stigid] * count)
+            self._extend("vid", vulns)
+            for field in ("severity", "severity_override", "status"):
+                self._extend(field, (x[field] for x in vulns.values()))
+
+    def add_files(self, files: list[str], workers: int = None) -> dict:
+        """
+        Load many checklist files in parallel and append their rows. Each
+        summary is encoded as it arrives and then released, so summaries are
+        never all held at once. Rows are appended in the order the files
+        finish loading.
+
+        Args:
+            files (list[str]): Paths to checklist files or archive members
+            workers (int): Number of worker processes for iter_many()
+
+        Returns:
+            dict[Path, Exception]: Files that failed to load
+        """
+        errors = {}
+        for file, summary, error in iter_many(files, workers=workers):
+            if error is None:
+                self.add_summary(summary)
+            else:
+                errors[file] = error
+        return errors
+
+    def column(self, name: str) -> list:
+        """
+        Return the decoded values of a column.
+
+        Args:
+            name (str): Column name
+
+        Returns:
+            list: Column values, one per row
+
+        Raises:
+            ValueError: If the column is not recognized
+        """
+        check_fields((name,), TABLE_COLUMNS)
+        values = self._values[name]
+        return [values[x] for x in self._codes[name]]
+
+    def filter(self, category: str = None, **predicates) -> "VulnTable":
+        """
+        Return a new table of the rows matching all predicates.
+
+        Each predicate is a column name and either a value to match, or a
+        set, list or tuple of values any of which may match.
+
+        Args:
+            category (str): CAT level 'I', 'II' or 'III', matched on severity
+                without applying overrides
+            **predicates: Column predicates, e.g. status="Open",
+                severity={"high", "medium"}
+
+        Returns:
+            VulnTable: Matching rows
+
+        Raises:
+            ValueError: If a column or category is not recognized
+        """
+        rows = self._select(category, predicates)
+        table = VulnTable()
+        for name in self.columns:
+            table._values[name] = list(self._values[name])
+            table._lookup[name] = dict(self._lookup[name])
+            codes = self._codes[name]
+            if rows is not None:
+                codes = map(codes.__getitem__, rows)
+            table._codes[name] = array(self._codes[name].typecode, codes)
+        return table
+
+    def counts(
+        self, group_by: tuple = ("status",), category: str = None, **predicates
+    ) -> dict:
+        """
+        Count the rows matching all predicates, grouped by columns.
+
+        Args:
+            group_by (tuple[str]): Columns to group by
+            category (str): CAT level 'I', 'II' or 'III', matched on severity
+                without applying overrides
+            **predicates: Column predicates, as for filter()
+
+        Returns:
+            dict: Counts keyed by the group value, or by a tuple of values
+                when grouping by more than one column
+
+        Raises:
+            ValueError: If a column or category is not recognized
+        """
+        group_by = group_fields(group_by)
+        check_fields(group_by, TABLE_COLUMNS)
+        rows = self._select(category, predicates)
+        columns = [self._codes[x] for x in group_by]
+        if rows is not None:
+            columns = [list(map(codes.__getitem__, rows)) for codes in columns]
+        values = [self._values[x] for x in group_by]
+        if len(group_by) == 1:
+            return {values[0][x]: y for x, y in Counter(columns[0]).items()}
+        return {
+            tuple(v[c] for v, c in zip(values, key)): count
+            for key, count in Counter(zip(*columns)).items()
+        }
+
+    def rows(self):
+        """
+        Iterate over the rows as dictionaries of decoded values.
+
+        Yields:
+            dict: Row
+        """
+        columns = [self.column(x) for x in self.columns]
+        for row in zip(*columns):
+            yield dict(zip(self.columns, row))
+
+    def to_csv(self, output_file: Path, force: bool = False):
+        """
+        Write the table as CSV with a header row, compressed when the name
+        ends in .gz, .xz or .bz2. Missing values are written as empty fields.
+
+        Args:
+            output_file (Path): Path to output file
+            force (bool): Whether to overwrite an existing file
+
+        Raises:
+            FileExistsError: If output file exists and force is not set
+        """
+
+        def write(fh):
+            text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(self.columns)
+            writer.writerows(zip(*(self.column(x) for x in self.columns)))
+            text.flush()
+            text.detach()
+
+        self._write(output_file, write, force)
+
+    def to_jsonl(self, output_file: Path, force: bool = False):
+        """
+        Write the table as one JSON object per line, compressed when the name
+        ends in .gz, .xz or .bz2.
+
+        Args:
+            output_file (Path): Path to output file
+            force (bool): Whether to overwrite an existing file
+
+        Raises:
+            FileExistsError: If output file exists and force is not set
+        """
+
+        def write(fh):
+            for row in self.rows():
+                fh.write(json.dumps(row, ensure_ascii=False).encode() + b"\n")
+
+        self._write(output_file, write, force)
+
+    def _write(self, output_file: Path, write, force: bool):
+        """
+        Write an export atomically, compressed according to its suffix.
+        """
+        output_file = Path(output_file)
+        if output_file.exists() and not force:
+            raise FileExistsError(
+                f"{output_file} already exists. Pass 'force=True' to overwrite."
+            )
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        compression = SUFFIX_COMPRESSION.get(output_file.suffix.lower())
+        atomic_write(output_file, write, compression)
+
+    def _select(self, category: str, predicates: dict) -> list[int]:
+        """
+        Indices of the rows matching all predicates, or None for all rows.
+        """
+        predicates = category_filters(category, predicates)
+        check_fields(predicates, TABLE_COLUMNS)
+        rows = None
+        for name, value in predicates.items():
+            lookup = self._lookup[name]
+            wanted = {lookup[x] for x in filter_values(value) if x in lookup}
+            codes = self._codes[name]
+            if rows is None:
+                mask = map(wanted.__contains__, codes)
+                rows = list(compress(range(len(codes)), mask))
+            else:
+                mask = map(wanted.__contains__, map(codes.__getitem__, rows))
+                rows = list(compress(rows, mask))
+        return rows
+
+    def _encode(self, name: str, value) -> int:
+        """
+        Return the code of a value in a column's dictionary, adding it and
+        widening the column's codes if needed.
+        """
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._values[name])
+            self._values[name].append(value)
+            codes = self._codes[name]
+            for typecode, limit in CODE_TYPES:
+                if code < limit:
+                    break
+            if codes.typecode != typecode:
+                self._codes[name] = array(typecode, codes)
+        return code
+
+    def _extend(self, name: str, values):
+        """
+        Append values to a column.
+        """
+        codes = [self._encode(name, x) for x in values]
+        self._codes[name].extend(codes)
+
+    def __len__(self) -> int:
+        return len(self._codes["vid"])
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+from pigsty.resources.checklist import Checklist
+
+RHEL9_FILE = Path("./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl")
+
+
+@pytest.fixture
+def fleet_checklists() -> list[Checklist]:
+    """
+    Two checklists of hosts 'one' and 'two': V-257777 is Open on one and
+    NotAFinding on two, and V-258134 is Open on both.
+    """
+    checklists = []
+    for host, status in (("one", "Open"), ("two", "NotAFinding")):
+        checklist = Checklist(RHEL9_FILE)
+        checklist.asset.set("HOST_NAME", host)
+        checklist.stigs[0].vuln_nodes["V-257777"].status = status
+        checklist.stigs[0].vuln_nodes["V-258134"].status = "Open"
+        checklists.append(checklist)
+    return checklists
@@ -0,0 +1,88 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+from pigsty.resources.archive import ArchiveIndex, ArchiveMember
+from pigsty.resources.benchmark import DISABenchmark
+from pigsty.resources.checklist import Checklist, load_many
+from pigsty.resources.openscap import OpenSCAPSTIGViewerResult
+
+CHECKLIST = "U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+BENCHMARK = "U_RHEL_9_STIG_V1R1_Manual-xccdf.xml"
+
+
+class TestArchive:
+    checklist_file = Path("./tests/files/checklists") / CHECKLIST
+    openscap_file = Path("./tests/files/openscap/stigviewer-xccdf.xml")
+    benchmark_file = Path("./tests/files/benchmark") / BENCHMARK
+
+    @pytest.fixture
+    def bundle(self, tmp_path):
+        inner = tmp_path / "inner.zip"
+        with zipfile.ZipFile(inner, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(self.benchmark_file, f"U_RHEL_9_V1R1_STIG/{BENCHMARK}")
+        bundle = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(self.checklist_file, f"checklists/{CHECKLIST}")
+            zf.write(self.openscap_file, "results/stigviewer-xccdf.xml")
+            zf.write(inner, "U_RHEL_9_V1R1_STIG.zip")
+        inner.unlink()
+        return bundle
+
+    def test_index(self, bundle):
+        index = ArchiveIndex(bundle)
+        assert sorted(index) == [
+            "U_RHEL_9_V1R1_STIG.zip",
+            f"U_RHEL_9_V1R1_STIG.zip/U_RHEL_9_V1R1_STIG/{BENCHMARK}",
+            f"checklists/{CHECKLIST}",
+            "results/stigviewer-xccdf.xml",
+        ]
+        member = index[f"U_RHEL_9_V1R1_STIG.zip/U_RHEL_9_V1R1_STIG/{BENCHMARK}"]
+        assert member.parents == ("U_RHEL_9_V1R1_STIG.zip",)
+        assert member.name == BENCHMARK
+        assert member.size == self.benchmark_file.stat().st_size
+        assert member.read_bytes() == self.benchmark_file.read_bytes()
+        assert index.find("*manual-xccdf.xml") == [member]
+        assert len(index.xccdf()) == 2
+        assert [x.name for x in index.checklists()] == [CHECKLIST]
+        assert len(ArchiveIndex(bundle, nested=False)) == 3
+
+    def test_loaders(self, bundle):
+        index = ArchiveIndex(bundle)
+        member = index.checklists()[0]
+        checklist = Checklist(member)
+        assert checklist.file == member
+        assert checklist.summary() == {
+            **Checklist(self.checklist_file).summary(),
+            "file": str(member),
+        }
+        assert sum(1 for _ in Checklist.iter_vulns(member)) == len(
+            checklist.stigs[0].vuln_nodes
+        )
+        assert Checklist.peek(member)[1] == Checklist.peek(self.checklist_file)[1]
+
+        result = OpenSCAPSTIGViewerResult(index["results/stigviewer-xccdf.xml"])
+        expected = OpenSCAPSTIGViewerResult(self.openscap_file)
+        assert result.hostname == expected.hostname
+        assert len(result.rule_results) == len(expected.rule_results)
+
+        benchmark = DISABenchmark(index.find(f"*{BENCHMARK}")[0])
+        rule = benchmark.rules["V-257777"]
+        assert rule.fixtext == "Upgrade to a supported version of RHEL 9."
+        assert sorted(x.name for x in bundle.parent.iterdir()) == ["bundle.zip"]
+
+    def test_save_from_member(self, bundle, tmp_path):
+        member = ArchiveIndex(bundle).checklists()[0]
+        checklist = Checklist(member)
+        checklist.stigs[0].vuln_nodes["V-257777"].status = "Open"
+        output = tmp_path / "out" / CHECKLIST
+        checklist.save(output, incremental=True)
+        assert Checklist(output).stigs[0].vuln_nodes["V-257777"].status == "Open"
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_many(self, bundle, workers):
+        member = ArchiveMember(bundle, f"checklists/{CHECKLIST}")
+        missing = ArchiveMember(bundle, "checklists/missing.ckl")
+        summaries, errors = load_many([member, missing], workers=workers)
+        assert summaries[member]["file"] == str(member)
+        assert isinstance(errors[missing], FileNotFoundError)
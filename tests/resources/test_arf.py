@@ -0,0 +1,56 @@
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+from pigsty.resources.arf import (
+    OVAL_RESULTS,
+    SYSTEM_CHARACTERISTICS,
+    TEST_RESULT,
+    AssetReportCollection,
+)
+from pigsty.resources.openscap import NS, OpenSCAPSTIGViewerResult
+
+
+class TestAssetReportCollection:
+    arf_file = Path("./tests/files/arf/arf-results.xml")
+    bad_file = Path("./tests/files/checklists/bad.ckl")
+
+    def test_index(self):
+        arf = AssetReportCollection(self.arf_file)
+        assert list(arf.report_requests) == ["collection1"]
+        assert list(arf.assets) == ["asset0"]
+        assert list(arf.reports) == ["xccdf1", "oval0"]
+        assert [x.report for x in arf.contents[TEST_RESULT]] == ["xccdf1"]
+        assert [x.report for x in arf.contents[OVAL_RESULTS]] == ["oval0"]
+        assert [x.report for x in arf.contents[SYSTEM_CHARACTERISTICS]] == ["oval0"]
+        assert not arf._loaded
+
+    def test_xccdf_result(self):
+        arf = AssetReportCollection(self.arf_file)
+        result = arf.xccdf_result
+        assert isinstance(result, OpenSCAPSTIGViewerResult)
+        assert arf.xccdf_result is result
+        assert result.hostname == {"one"}
+        assert sorted(result.rule_results) == ["V-257777", "V-258134", "V-258238"]
+        assert result.rule_results["V-258134"].result == "fail"
+        assert OVAL_RESULTS not in arf._loaded
+
+    def test_oval_sections(self):
+        arf = AssetReportCollection(self.arf_file)
+        characteristics = arf.system_characteristics
+        assert characteristics.tag == SYSTEM_CHARACTERISTICS
+        host = characteristics.find(".//oval-characteristics:primary_host_name", NS)
+        assert host.text == "one"
+        assert OVAL_RESULTS not in arf._loaded
+        assert arf.oval_results.root.tag == OVAL_RESULTS
+        assert arf.oval_results.result("oval:ssg-package_aide_installed:def:1") == "false"
+
+    def test_element(self):
+        arf = AssetReportCollection(self.arf_file)
+        asset = arf.element(arf.assets["asset0"])
+        assert asset.get("id") == "asset0"
+        assert asset.find(".//ai:fqdn", NS).text == "one"
+
+    def test_bad_file(self):
+        with pytest.raises(ET.ParseError):
+            AssetReportCollection(self.bad_file)
@@ -0,0 +1,140 @@
+import gzip
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+from pigsty.resources import benchmark
+from pigsty.resources.archive import ArchiveMember
+from pigsty.resources.benchmark import BenchmarkRule, DISABenchmark
+
+XCCDF_11 = "http://checklists.nist.gov/xccdf/1.1"
+
+
+class TestDISABenchmark:
+    benchmark_file = Path("./tests/files/benchmark/U_RHEL_9_STIG_V1R1_Manual-xccdf.xml")
+    bad_file = Path("./tests/files/checklists/bad.ckl")
+
+    def test_metadata(self):
+        stig = DISABenchmark(self.benchmark_file)
+        assert stig.id == "RHEL_9_STIG"
+        assert stig.title == (
+            "Red Hat Enterprise Linux 9 Security Technical Implementation Guide"
+        )
+        assert stig.version == "1"
+        assert stig.status == "accepted"
+        assert stig.release_info == "Release: 1 Benchmark Date: 22 Sep 2023"
+
+    def test_indexes(self):
+        stig = DISABenchmark(self.benchmark_file)
+        assert list(stig.rules) == ["V-257777", "V-257780", "V-258134"]
+        rule = stig.rules["V-258134"]
+        assert stig.rule_ids["SV-258134r926389_rule"] is rule
+        assert stig.stig_ids["RHEL-09-651010"] is rule
+        assert stig.ccis["CCI-002696"] == [rule]
+        assert stig.legacy_ids["V-72067"] == [stig.rules["V-257780"]]
+        assert rule.as_dict() == {
+            "vid": "V-258134",
+            "rule_id": "SV-258134r926389_rule",
+            "stig_id": "RHEL-09-651010",
+            "group_title": "SRG-OS-000363-GPOS-00150",
+            "title": "RHEL 9 must have the AIDE package installed.",
+            "severity": "medium",
+            "weight": "10.0",
+            "legacy_ids": (),
+            "ccis": ("CCI-001744", "CCI-002696"),
+        }
+
+    @pytest.mark.parametrize(
+        "identifier,vids",
+        [
+            ("V-257777", ["V-257777"]),
+            ("SV-257780r939261_rule", ["V-257780"]),
+            ("RHEL-09-651010", ["V-258134"]),
+            ("SV-86691", ["V-257780"]),
+            ("CCI-000366", ["V-257777"]),
+            ("V-1", []),
+        ],
+    )
+    def test_find(self, identifier, vids):
+        stig = DISABenchmark(self.benchmark_file)
+        assert [x.vid for x in stig.find(identifier)] == vids
+
+    def test_lazy_text(self):
+        stig = DISABenchmark(self.benchmark_file)
+        assert "description" not in BenchmarkRule.__slots__
+        rules = ET.parse(self.benchmark_file).getroot().iter(f"{{{XCCDF_11}}}Rule")
+        for rule in rules:
+            record = stig.rule(rule.get("id"))
+            assert record.description == rule.findtext(f"{{{XCCDF_11}}}description")
+            assert record.fixtext == rule.findtext(f"{{{XCCDF_11}}}fixtext")
+            assert record.check_content == rule.findtext(
+                f"{{{XCCDF_11}}}check/{{{XCCDF_11}}}check-content"
+            )
+        assert "&amp;" not in stig.rules["V-258134"].check_content
+        assert stig.rules["V-258134"].as_dict(text=True)["fixtext"].startswith(
+            "Install AIDE"
+        )
+
+    def test_small_chunks(self, monkeypatch):
+        expected = DISABenchmark(self.benchmark_file)
+        monkeypatch.setattr(benchmark, "READ_CHUNK_SIZE", 7)
+        stig = DISABenchmark(self.benchmark_file, autoload=False)
+        rules = list(stig.iter_rules())
+        assert all(isinstance(x, BenchmarkRule) for x in rules)
+        assert [x.as_dict(text=True) for x in rules] == [
+            x.as_dict(text=True) for x in expected.rules.values()
+        ]
+        assert not stig.rules
+
+    def test_xccdf_12(self, tmp_path):
+        data = self.benchmark_file.read_text()
+        data = data.replace(XCCDF_11, "http://checklists.nist.gov/xccdf/1.2")
+        data = data.replace('id="V-', 'id="xccdf_mil.disa.stig_group_V-')
+        data = data.replace('id="SV-', 'id="xccdf_mil.disa.stig_rule_SV-')
+        file = tmp_path / "benchmark-1.2.xml"
+        file.write_text(data)
+        stig = DISABenchmark(file)
+        assert list(stig.rules) == ["V-257777", "V-257780", "V-258134"]
+        rule = stig.rule("SV-257777r925318_rule")
+        assert rule.rule_id == "xccdf_mil.disa.stig_rule_SV-257777r925318_rule"
+        assert stig.rule(rule.rule_id) is rule
+        assert rule.fixtext == "Upgrade to a supported version of RHEL 9."
+
+    def test_bad_file(self):
+        with pytest.raises(ET.ParseError):
+            DISABenchmark(self.bad_file)
+
+    def test_compressed_text(self, tmp_path, monkeypatch):
+        expected = DISABenchmark(self.benchmark_file)
+        expected = {x: y.as_dict(text=True) for x, y in expected.rules.items()}
+        file = tmp_path / "benchmark.xml.gz"
+        file.write_bytes(gzip.compress(self.benchmark_file.read_bytes()))
+        stig = DISABenchmark(file)
+        opened = []
+        open_source = benchmark.open_source
+        monkeypatch.setattr(
+            benchmark, "open_source", lambda x: opened.append(x) or open_source(x)
+        )
+        assert {x: y.as_dict(text=True) for x, y in stig.rules.items()} == expected
+        assert opened == [file]
+        assert {x: y.as_dict(text=True) for x, y in stig.rules.items()} == expected
+        assert opened == [file, file]
+        stig.close()
+        assert stig._reader is None
+
+    def test_archive_text(self, tmp_path):
+        expected = DISABenchmark(self.benchmark_file)
+        expected = {x: y.as_dict(text=True) for x, y in expected.rules.items()}
+        file = tmp_path / "benchmark.zip"
+        with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.write(self.benchmark_file, self.benchmark_file.name)
+        with DISABenchmark(ArchiveMember(file, self.benchmark_file.name)) as stig:
+            assert {
+                x: y.as_dict(text=True) for x, y in stig.rules.items()
+            } == expected
+            assert not any(
+                isinstance(x, (bytes, bytearray)) for x in vars(stig).values()
+            )
+            assert getattr(stig, "_content", None) is None
+        assert stig._reader is None
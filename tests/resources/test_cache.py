@@ -0,0 +1,102 @@
+import os
+import shutil
+from pathlib import Path
+
+from pigsty.resources.cache import ParseCache
+
+
+class TestParseCache:
+    rhel9_file = Path(
+        "./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+    )
+    stigviewer = Path("./tests/files/openscap/stigviewer-xccdf.xml")
+
+    def test_checklist_hit(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        first = cache.checklist(self.rhel9_file)
+        second = cache.checklist(self.rhel9_file)
+        assert first == second
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert ParseCache(tmp_path / "cache").checklist(self.rhel9_file) == first
+
+    def test_openscap_hit(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache", hash_content=True)
+        first = cache.openscap(self.stigviewer)
+        assert cache.openscap(self.stigviewer) == first
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first["hostname"] == {"one"}
+        assert first["rule_results"]["V-257837"]["result"] == "pass"
+
+    def test_changed_file(self, tmp_path):
+        file = tmp_path / "checklist.ckl"
+        shutil.copy(self.rhel9_file, file)
+        cache = ParseCache(tmp_path / "cache")
+        cache.checklist(file)
+        stat = file.stat()
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        cache.checklist(file)
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_invalidate_and_clear(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        cache.checklist(self.rhel9_file)
+        cache.invalidate(self.rhel9_file)
+        cache.checklist(self.rhel9_file)
+        assert cache.misses == 2
+        cache.clear()
+        assert not list(cache.directory.iterdir())
+
+    def test_not_path(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        data = self.rhel9_file.read_bytes()
+        expected = cache.checklist(self.rhel9_file)
+        with open(self.rhel9_file, "rb") as fh:
+            for source in (data, fh):
+                summary = cache.checklist(source)
+                assert summary["stigs"] == expected["stigs"]
+                cache.invalidate(source)
+        assert (cache.hits, cache.misses) == (0, 3)
+        assert len(list(cache.directory.iterdir())) == 1
+
+    def test_eviction(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        cache.openscap(self.stigviewer)
+        cache.max_size = sum(x.stat().st_size for x in cache.directory.iterdir())
+        cache.checklist(self.rhel9_file)
+        cache.openscap(self.stigviewer)
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    def test_eviction_index(self, tmp_path, monkeypatch):
+        files = []
+        for name in ("one", "two", "three"):
+            file = tmp_path / f"{name}.ckl"
+            shutil.copy(self.rhel9_file, file)
+            files.append(file)
+        cache = ParseCache(tmp_path / "cache")
+        cache.checklist(files[0])
+        cache.max_size = cache._size * 2 + 100
+        monkeypatch.setattr(cache, "_scan", None)
+        for file in files[1:]:
+            cache.checklist(file)
+        entries = [cache._entry("checklist", x) for x in files[1:]]
+        assert list(cache._index) == entries
+        assert sorted(cache.directory.iterdir()) == sorted(entries)
+        assert cache._size == sum(x.stat().st_size for x in entries)
+        cache.checklist(files[1])
+        assert cache.hits == 1
+        assert list(cache._index) == entries[::-1]
+
+    def test_hit_removed_entry(self, tmp_path, monkeypatch):
+        cache = ParseCache(tmp_path)
+        expected = cache.checklist(self.rhel9_file)
+        entry = cache._entry("checklist", self.rhel9_file)
+
+        def utime(path):
+            Path(path).unlink()
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(os, "utime", utime)
+        assert cache.checklist(self.rhel9_file) == expected
+        assert cache.hits == 1
+        assert entry not in cache._index
+        assert cache._size == 0
@@ -1,8 +1,22 @@
+import bz2
+import gzip
+import lzma
+import shutil
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
 import pytest
-from pigsty.resources.checklist import AssetNode, Checklist, StigNode
+from pigsty.resources import checklist as checklist_module
+from pigsty.resources.checklist import (
+    AssetNode,
+    Checklist,
+    StigNode,
+    StigTemplates,
+    iter_many,
+    load_many,
+)
+from pigsty.resources.openscap import OpenSCAPSTIGViewerResult
 
 
 class TestChecklist:
@@ -95,7 +109,7 @@ class TestChecklist:
         self.rhel9_ckl.load()
         vulns = self.rhel9_ckl.stigs[0].vuln_nodes
         assert len(vulns) > 0
-        assert isinstance(vulns, dict)
+        assert isinstance(vulns, Mapping)
         for k, v in vulns.items():
             assert k == v.vuln_num
             assert v.status in ["NotAFinding", "Open", "Not_Reviewed", "Not_Applied"]
@@ -142,3 +156,340 @@ class TestChecklist:
         assert len(vulns) > 0
         for v in vulns.values():
             assert any((v.get(key) is None, isinstance(v.get(key), (str))))
+
+    def test_iter_vulns(self):
+        previous = None
+        count = 0
+        for info, vuln in Checklist.iter_vulns(self.rhel9_file):
+            if previous is not None:
+                assert len(previous.node) == 0
+            assert info.get("stigid") == "xccdf_mil.disa.stig_benchmark_RHEL_9_STIG"
+            assert vuln.vuln_num.startswith("V-")
+            assert vuln.status == "Not_Reviewed"
+            previous = vuln
+            count += 1
+        assert count == 416
+
+    def test_iter_vulns_bad_file(self):
+        with pytest.raises(ET.ParseError):
+            list(Checklist.iter_vulns(self.bad_file))
+
+    def test_vuln_node_index(self):
+        self.rhel9_ckl.load()
+        vuln = self.rhel9_ckl.stigs[0].vuln_nodes["V-257777"]
+        for key in ["Severity", "Rule_ID", "Rule_Title", "CCI_REF", "Missing"]:
+            expected = vuln.node.find(
+                f'.//STIG_DATA/VULN_ATTRIBUTE[.="{key}"]/../ATTRIBUTE_DATA'
+            )
+            assert vuln.get(key) == (None if expected is None else expected.text)
+        assert len(vuln.items()) == len(vuln.node.findall("STIG_DATA"))
+        vuln.status = "Open"
+        assert vuln.status == "Open"
+        assert vuln.node.find("STATUS").text == "Open"
+
+    def test_stig_info_node_read_only(self):
+        self.rhel9_ckl.load()
+        info = self.rhel9_ckl.stigs[0].info
+        before = len(list(info.node.iter()))
+        assert info.as_dict()["customname"] == ""
+        assert "stigid" in info.keys()
+        assert len(list(info.node.iter())) == before
+        with pytest.raises(PermissionError):
+            info.set("stigid", "other")
+
+    @pytest.mark.parametrize("chunk_size", [7, 65536])
+    def test_peek(self, chunk_size):
+        self.rhel9_ckl.load()
+        asset, stigs = Checklist.peek(self.rhel9_file, chunk_size=chunk_size)
+        assert isinstance(asset, AssetNode)
+        assert asset.as_dict() == self.rhel9_ckl.asset.as_dict()
+        assert stigs == [stig.info.as_dict() for stig in self.rhel9_ckl.stigs]
+
+    def test_peek_multiple_stigs(self, tmp_path):
+        text = self.rhel9_file.read_text()
+        start = text.index("<iSTIG>")
+        end = text.index("</iSTIG>") + len("</iSTIG>")
+        second = text[start:end].replace("RHEL_9_STIG", "RHEL_9_OTHER")
+        combined = tmp_path / "combined.ckl"
+        combined.write_text(text[:end] + second + text[end:])
+        asset, stigs = Checklist.peek(combined, chunk_size=1024)
+        assert asset.get("TARGET_KEY") == "5551"
+        assert [x["stigid"] for x in stigs] == [
+            "xccdf_mil.disa.stig_benchmark_RHEL_9_STIG",
+            "xccdf_mil.disa.stig_benchmark_RHEL_9_OTHER",
+        ]
+
+    def test_not_checklist(self):
+        with pytest.raises(ValueError, match="no ASSET element"):
+            Checklist(Path("./tests/files/arf/arf-results.xml"))
+        with pytest.raises(ValueError, match="no STIGS element"):
+            Checklist(b"<CHECKLIST><ASSET/></CHECKLIST>")
+
+    def test_peek_bad_file(self):
+        with pytest.raises(ET.ParseError):
+            Checklist.peek(self.bad_file)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_many(self, workers):
+        summaries, errors = load_many(
+            [self.rhel9_file, self.bad_file, self.rhel9_file], workers=workers
+        )
+        assert list(summaries) == [self.rhel9_file]
+        assert list(errors) == [self.bad_file]
+        assert isinstance(errors[self.bad_file], ET.ParseError)
+        summary = summaries[self.rhel9_file]
+        assert summary["asset"]["TARGET_KEY"] == "5551"
+        vulns = summary["stigs"][0]["vulnerabilities"]
+        assert len(vulns) == 416
+        assert vulns["V-257777"] == {
+            "status": "Not_Reviewed",
+            "severity": "high",
+            "severity_override": None,
+        }
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_many_not_checklist(self, workers):
+        arf_file = Path("./tests/files/arf/arf-results.xml")
+        summaries, errors = load_many([arf_file, self.rhel9_file], workers=workers)
+        assert list(summaries) == [self.rhel9_file]
+        assert list(errors) == [arf_file]
+        assert isinstance(errors[arf_file], ValueError)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iter_many(self, monkeypatch, workers):
+        monkeypatch.setattr(checklist_module, "PENDING_PER_WORKER", 1)
+        results = iter_many([self.rhel9_file, self.bad_file] * 3, workers=workers)
+        assert isinstance(results, Iterator)
+        results = list(results)
+        assert len(results) == 6
+        loaded = [x for x in results if x[2] is None]
+        assert [x[0] for x in loaded] == [self.rhel9_file] * 3
+        assert all(len(x[1]["stigs"][0]["vulnerabilities"]) == 416 for x in loaded)
+        failed = [x for x in results if x[2] is not None]
+        assert all(x[0] == self.bad_file and x[1] is None for x in failed)
+        assert all(isinstance(x[2], ET.ParseError) for x in failed)
+
+    def test_vuln_nodes_lazy(self):
+        stig = Checklist(self.rhel9_file).stigs[0]
+        vulns = stig.vuln_nodes
+        assert vulns._elements is None
+        vuln = vulns["V-257777"]
+        assert vuln.vuln_num == "V-257777"
+        assert vulns["V-257777"] is vuln
+        assert list(vulns._nodes) == ["V-257777"]
+        assert "V-0" not in vulns
+        with pytest.raises(KeyError):
+            vulns["V-0"]
+
+    def test_apply_openscap(self):
+        ckl = Checklist(self.rhel9_file)
+        result = OpenSCAPSTIGViewerResult("./tests/files/openscap/stigviewer-xccdf.xml")
+        summary = ckl.apply_openscap(result, finding_details=True)
+        vulns = ckl.stigs[0].vuln_nodes
+        for vid, (old, new) in summary["updated"].items():
+            assert old == "Not_Reviewed"
+            assert vulns[vid].status == new
+            assert result.rule_results[vid].rule_id in vulns[vid].finding_details
+        assert all(vid not in vulns for vid in summary["missing"])
+        assert vulns["V-257777"].status == "NotAFinding"
+        again = ckl.apply_openscap(result, overwrite_policy="not_reviewed")
+        assert not again["updated"]
+
+    def test_apply_openscap_unchanged(self):
+        ckl = Checklist(self.rhel9_file)
+        result = OpenSCAPSTIGViewerResult("./tests/files/openscap/stigviewer-xccdf.xml")
+        vulns = ckl.stigs[0].vuln_nodes
+        vulns["V-257777"].status = "NotAFinding"
+        vulns["V-257777"].dirty = False
+        summary = ckl.apply_openscap(result, finding_details=True)
+        assert "V-257777" in summary["unchanged"]
+        assert vulns["V-257777"].finding_details is None
+        assert vulns["V-257777"] not in vulns.dirty()
+
+    def test_apply_openscap_bad_policy(self):
+        ckl = Checklist(self.rhel9_file)
+        result = OpenSCAPSTIGViewerResult("./tests/files/openscap/stigviewer-xccdf.xml")
+        with pytest.raises(ValueError):
+            ckl.apply_openscap(result, overwrite_policy="sometimes")
+
+    def test_save(self, tmp_path):
+        ckl = Checklist(self.rhel9_file)
+        ckl.stigs[0].vuln_nodes["V-257777"].status = "Open"
+        output = tmp_path / "out" / "checklist.ckl"
+        ckl.save(output)
+        with pytest.raises(FileExistsError):
+            ckl.save(output)
+        ckl.save(output, force=True)
+        assert [x.name for x in output.parent.iterdir()] == ["checklist.ckl"]
+        saved = Checklist(output)
+        assert saved.stigs[0].vuln_nodes["V-257777"].status == "Open"
+        assert saved.summary()["stigs"] == ckl.summary()["stigs"]
+
+    def test_save_gzip(self, tmp_path):
+        ckl = Checklist(self.rhel9_file)
+        output = tmp_path / "checklist.ckl.gz"
+        ckl.save(output, compression="gzip")
+        with gzip.open(output) as fh:
+            assert ET.parse(fh).getroot().tag == "CHECKLIST"
+        with pytest.raises(ValueError):
+            ckl.save(output, force=True, compression="zip")
+
+    @pytest.mark.parametrize(
+        "suffix,module", [(".gz", gzip), (".xz", lzma), (".bz2", bz2)]
+    )
+    def test_compressed_roundtrip(self, tmp_path, suffix, module):
+        ckl = Checklist(self.rhel9_file)
+        output = tmp_path / f"checklist.ckl{suffix}"
+        ckl.save(output, incremental=True)
+        with module.open(output) as fh:
+            assert fh.read() == self.rhel9_file.read_bytes()
+        loaded = Checklist(output)
+        assert loaded.summary()["stigs"] == ckl.summary()["stigs"]
+        assert Checklist.peek(output)[1] == Checklist.peek(self.rhel9_file)[1]
+        assert sum(1 for _ in Checklist.iter_vulns(output)) == len(
+            ckl.stigs[0].vuln_nodes
+        )
+        mtime = output.stat().st_mtime_ns
+        loaded.save(output, force=True, incremental=True)
+        assert output.stat().st_mtime_ns == mtime
+        loaded.stigs[0].vuln_nodes["V-257777"].status = "Open"
+        loaded.save(output, force=True, incremental=True)
+        with module.open(output) as fh:
+            data = fh.read()
+        assert data.startswith(b'<?xml version="1.0" encoding="UTF-8"?>\n<!--DISA')
+        assert Checklist(output).stigs[0].vuln_nodes["V-257777"].status == "Open"
+
+    def test_templates(self, tmp_path):
+        changed = tmp_path / "changed.ckl"
+        changed.write_bytes(
+            self.rhel9_file.read_bytes().replace(
+                b"Upgrade to a supported version of RHEL 9.", b"Upgrade RHEL 9."
+            )
+        )
+        templates = StigTemplates()
+        first = Checklist(self.rhel9_file, templates=templates)
+        second = Checklist(self.rhel9_file, templates=templates)
+        third = Checklist(changed, templates=templates)
+        assert len(templates) == 1
+        for vid in ("V-257780", "V-258134"):
+            data = second.stigs[0].vuln_nodes[vid].node.findall("STIG_DATA")
+            expected = first.stigs[0].vuln_nodes[vid].node.findall("STIG_DATA")
+            assert len(data) == len(expected)
+            assert all(
+                x is y
+                for x, y in zip(data, expected)
+                if x.findtext("VULN_ATTRIBUTE") != "STIG_UUID"
+            )
+        shared = first.stigs[0].vuln_nodes["V-257780"].node.find("STIG_DATA")
+        assert third.stigs[0].vuln_nodes["V-257780"].node.find("STIG_DATA") is shared
+        own = third.stigs[0].vuln_nodes["V-257777"]
+        assert own.get("Fix_Text") == "Upgrade RHEL 9."
+        assert own.node.find("STIG_DATA") is not first.stigs[0].vuln_nodes[
+            "V-257777"
+        ].node.find("STIG_DATA")
+
+        second.stigs[0].vuln_nodes["V-257780"].status = "Open"
+        assert first.stigs[0].vuln_nodes["V-257780"].status == "Not_Reviewed"
+        output = tmp_path / "second.ckl"
+        second.save(output)
+        saved = Checklist(output)
+        assert saved.stigs[0].vuln_nodes["V-257780"].status == "Open"
+        assert saved.summary()["stigs"] == second.summary()["stigs"]
+        assert saved.stigs[0].vuln_nodes["V-257780"].items() == (
+            Checklist(self.rhel9_file).stigs[0].vuln_nodes["V-257780"].items()
+        )
+
+    def test_templates_stig_uuid(self, tmp_path):
+        other = tmp_path / "other.ckl"
+        other.write_bytes(
+            self.rhel9_file.read_bytes().replace(
+                b"512b051a-1823-4bb4-83f5-be6f1b950832",
+                b"00000000-0000-4000-8000-000000000000",
+            )
+        )
+        templates = StigTemplates()
+        first = Checklist(self.rhel9_file, templates=templates)
+        second = Checklist(other, templates=templates)
+        assert templates.intern(second.stigs[0]) == len(second.stigs[0].vuln_nodes)
+        assert len(templates) == 1
+        vuln = second.stigs[0].vuln_nodes["V-257780"]
+        expected = first.stigs[0].vuln_nodes["V-257780"]
+        assert vuln.get("STIG_UUID") == "00000000-0000-4000-8000-000000000000"
+        assert expected.get("STIG_UUID") == "512b051a-1823-4bb4-83f5-be6f1b950832"
+        for data, shared in zip(
+            vuln.node.iterfind("STIG_DATA"), expected.node.iterfind("STIG_DATA")
+        ):
+            if data.findtext("VULN_ATTRIBUTE") == "STIG_UUID":
+                assert data is not shared
+            else:
+                assert data is shared
+        output = tmp_path / "saved.ckl"
+        second.save(output)
+        saved = Checklist(output).stigs[0].vuln_nodes["V-257780"]
+        assert saved.items() == vuln.items()
+
+    def test_query(self):
+        ckl = Checklist(self.rhel9_file)
+        vuln_nodes = ckl.stigs[0].vuln_nodes
+        high = ckl.query(Severity="high")
+        assert len(high) == 18
+        assert all(x.get("Severity") == "high" for x in high)
+        assert len(ckl.query(status="Not_Reviewed", Severity={"high", "low"})) == 33
+        assert [x.get("Vuln_Num") for x in ckl.query(Rule_Ver="RHEL-09-211025")] == [
+            "V-257780"
+        ]
+        assert vuln_nodes["V-257784"] in ckl.query(CCI_REF="CCI-000366")
+        assert vuln_nodes["V-257784"] in ckl.query(CCI_REF="CCI-002235")
+        assert len(ckl.query(LEGACY_ID=None)) == 416
+        assert len(ckl.query(CCI_REF=["CCI-000366"])) == 168
+        assert ckl.query(Severity="critical") == []
+        with pytest.raises(ValueError, match="Unknown fields"):
+            ckl.query(Severty="high")
+        with pytest.raises(ValueError):
+            vuln_nodes.field_index("Not_An_Attribute")
+        assert len(ckl.query()) == 416
+
+        vuln_nodes["V-257780"].status = "Open"
+        vuln_nodes["V-257777"].status = "Open"
+        assert "status" not in vuln_nodes._field_indexes
+        assert "Severity" in vuln_nodes._field_indexes
+        assert [x.get("Vuln_Num") for x in ckl.query(status="Open")] == [
+            "V-257777",
+            "V-257780",
+        ]
+        assert ckl.stigs[0].query(status="Open", Severity="high") == [
+            vuln_nodes["V-257777"]
+        ]
+        vuln_nodes["V-257780"].severity_override = "low"
+        assert ckl.query(severity_override="low") == [vuln_nodes["V-257780"]]
+
+    def test_save_incremental(self, tmp_path):
+        source = tmp_path / "source.ckl"
+        shutil.copy(self.rhel9_file, source)
+        ckl = Checklist(source)
+        inode = source.stat().st_ino
+        ckl.save(source, force=True, incremental=True)
+        assert source.stat().st_ino == inode
+        vulns = ckl.stigs[0].vuln_nodes
+        vulns["V-257777"].status = "Open"
+        vulns["V-257780"].comments = "a < b & \"c\""
+        ckl.asset.set("HOST_NAME", "one")
+        assert {x.vuln_num for x in vulns.dirty()} == {"V-257777", "V-257780"}
+        output = tmp_path / "output.ckl"
+        ckl.save(output, incremental=True)
+        original = source.read_bytes()
+        empty = b"<COMMENTS></COMMENTS>"
+        second = original.index(empty, original.index(empty) + 1)
+        expected = (
+            original[:second]
+            + b'<COMMENTS>a &lt; b &amp; "c"</COMMENTS>'
+            + original[second + len(empty) :]
+        )
+        expected = expected.replace(
+            b"<HOST_NAME></HOST_NAME>", b"<HOST_NAME>one</HOST_NAME>"
+        ).replace(b"<STATUS>Not_Reviewed</STATUS>", b"<STATUS>Open</STATUS>", 1)
+        assert output.read_bytes() == expected
+        assert Checklist(output).summary()["stigs"] == ckl.summary()["stigs"]
+        ckl.save(source, force=True, incremental=True)
+        assert not vulns.dirty()
+        assert source.read_bytes() == expected
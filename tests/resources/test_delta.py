@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+import pytest
+from pigsty.resources.checklist import Checklist, StigTemplates
+from pigsty.resources.delta import (
+    TemplateStore,
+    load_delta,
+    render,
+    render_checklist,
+    save_delta,
+    to_delta,
+)
+
+
+class TestDelta:
+    rhel9_file = Path(
+        "./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+    )
+
+    def test_roundtrip(self, tmp_path):
+        store = TemplateStore(tmp_path / "templates")
+        output = tmp_path / "rhel9.json.gz"
+        save_delta(Checklist(self.rhel9_file), output, store)
+        assert output.stat().st_size < self.rhel9_file.stat().st_size // 100
+        delta = load_delta(output)
+        assert len(list(store.directory.iterdir())) == 1
+        assert delta["stigs"][0]["template"] in store
+        assert render(delta, store) == self.rhel9_file.read_bytes()
+        with pytest.raises(FileExistsError):
+            save_delta(Checklist(self.rhel9_file), output, store)
+
+    def test_header(self, tmp_path):
+        store = TemplateStore(tmp_path / "templates")
+        data = self.rhel9_file.read_bytes().replace(
+            b"<!--DISA STIG Viewer :: 2.17-->", b"<!--DISA STIG Viewer :: 2.16-->"
+        )
+        delta = to_delta(Checklist(data), store)
+        assert delta["header"].endswith("<!--DISA STIG Viewer :: 2.16-->\n")
+        assert render(delta, store) == data
+        del delta["header"]
+        assert render(delta, store) == self.rhel9_file.read_bytes()
+
+    def test_changes(self, tmp_path):
+        store = TemplateStore(tmp_path / "templates")
+        checklist = Checklist(self.rhel9_file)
+        checklist.asset.set("HOST_NAME", "one & two")
+        vuln = checklist.stigs[0].vuln_nodes["V-257780"]
+        vuln.status = "Open"
+        vuln.finding_details = "<missing>"
+        delta = to_delta(checklist, store)
+        other = to_delta(Checklist(self.rhel9_file), store)
+        assert delta["stigs"][0]["template"] == other["stigs"][0]["template"]
+        assert len(list(store.directory.iterdir())) == 1
+
+        templates = StigTemplates()
+        rendered = render_checklist(delta, store, templates=templates)
+        assert rendered.asset.get("HOST_NAME") == "one & two"
+        assert rendered.stigs[0].vuln_nodes["V-257780"].status == "Open"
+        assert rendered.stigs[0].vuln_nodes["V-257780"].finding_details == "<missing>"
+        assert rendered.summary()["stigs"] == checklist.summary()["stigs"]
+        assert len(templates) == 1
+
+    def test_stig_uuid(self, tmp_path):
+        store = TemplateStore(tmp_path / "templates")
+        data = self.rhel9_file.read_bytes().replace(
+            b"512b051a-1823-4bb4-83f5-be6f1b950832",
+            b"00000000-0000-4000-8000-000000000000",
+        )
+        delta = to_delta(Checklist(data), store)
+        other = to_delta(Checklist(self.rhel9_file), store)
+        assert delta["stigs"][0]["template"] == other["stigs"][0]["template"]
+        assert len(list(store.directory.iterdir())) == 1
+        assert render(delta, store) == data
+        assert render(other, store) == self.rhel9_file.read_bytes()
+
+    def test_errors(self, tmp_path):
+        store = TemplateStore(tmp_path / "templates")
+        delta = to_delta(Checklist(self.rhel9_file), store)
+        bad = tmp_path / "bad.json"
+        bad.write_text(json.dumps({"format": "other"}))
+        with pytest.raises(ValueError):
+            load_delta(bad)
+        with pytest.raises(KeyError):
+            render(delta, TemplateStore(tmp_path / "empty"))
+        delta["stigs"][0]["stig_data"].pop()
+        with pytest.raises(ValueError):
+            render(delta, store)
+        delta = to_delta(Checklist(self.rhel9_file), store)
+        delta["stigs"][0]["vulns"].pop()
+        with pytest.raises(ValueError):
+            render(delta, store)
@@ -0,0 +1,33 @@
+import pytest
+from pigsty.resources.filters import (
+    category_filters,
+    check_fields,
+    filter_values,
+    group_fields,
+)
+
+
+class TestFilters:
+    def test_filter_values(self):
+        assert filter_values("Open") == ("Open",)
+        assert filter_values(None) == (None,)
+        assert sorted(filter_values({"Open", "NotAFinding"})) == ["NotAFinding", "Open"]
+        assert filter_values(["high"]) == ("high",)
+
+    def test_group_fields(self):
+        assert group_fields("status") == ("status",)
+        assert group_fields(["host", "status"]) == ("host", "status")
+
+    def test_check_fields(self):
+        check_fields(("status",), ("status", "vid"))
+        with pytest.raises(ValueError, match="Unknown fields"):
+            check_fields(("stauts",), ("status", "vid"))
+
+    def test_category_filters(self):
+        assert category_filters("I", {"status": "Open"}) == {
+            "status": "Open",
+            "severity": "high",
+        }
+        assert category_filters(None, {}) == {}
+        with pytest.raises(ValueError):
+            category_filters("IV", {})
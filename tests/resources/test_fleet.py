@@ -0,0 +1,115 @@
+import os
+from pathlib import Path
+
+import pytest
+from pigsty.resources.checklist import Checklist
+from pigsty.resources.fleet import FleetIndex
+from pigsty.resources.table import VulnTable
+
+
+class TestFleetIndex:
+    rhel9_file = Path(
+        "./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+    )
+    bad_file = Path("./tests/files/checklists/bad.ckl")
+    arf_file = Path("./tests/files/arf/arf-results.xml")
+
+    @pytest.fixture
+    def fleet(self, tmp_path, fleet_checklists):
+        files = []
+        for checklist in fleet_checklists:
+            file = tmp_path / f"{checklist.asset.get('HOST_NAME')}.ckl"
+            checklist.save(file)
+            files.append(file)
+        return files
+
+    def test_update(self, tmp_path, fleet):
+        with FleetIndex(tmp_path / "fleet.db") as index:
+            result = index.update(fleet + [self.bad_file, self.arf_file], workers=2)
+            assert sorted(result["indexed"]) == sorted(map(str, fleet))
+            bad, arf = str(self.bad_file.resolve()), str(self.arf_file.resolve())
+            assert list(result["errors"]) == [bad, arf]
+            assert isinstance(result["errors"][arf], ValueError)
+            assert len(index) == 2
+            result = index.update(fleet, workers=1)
+            assert result["indexed"] == [] and len(result["skipped"]) == 2
+
+            checklist = Checklist(fleet[1])
+            checklist.stigs[0].vuln_nodes["V-257777"].status = "Open"
+            checklist.save(fleet[1], force=True)
+            stat_result = fleet[1].stat()
+            mtime_ns = stat_result.st_mtime_ns + 1
+            os.utime(fleet[1], ns=(stat_result.st_atime_ns, mtime_ns))
+            result = index.update(fleet, workers=1)
+            assert result["indexed"] == [str(fleet[1])]
+            assert index.counts(vid="V-257777") == {"Open": 2}
+
+            result = index.update(fleet[:1], workers=1, prune=True)
+            assert result["removed"] == [str(fleet[1])]
+            assert len(index) == 1
+            assert index.remove(fleet[:1]) == 1
+            assert len(index) == 0
+
+    def test_update_paths(self, tmp_path, monkeypatch, fleet):
+        with FleetIndex(tmp_path / "fleet.db") as index:
+            index.update(fleet, workers=1)
+            result = index.update((x for x in fleet), workers=1, prune=True)
+            assert result["removed"] == [] and len(result["skipped"]) == 2
+            assert len(index) == 2
+
+            monkeypatch.chdir(tmp_path)
+            result = index.update(["one.ckl", "./two.ckl"], workers=1)
+            assert len(result["skipped"]) == 2
+            assert len(index) == 2
+            assert index.remove(["./one.ckl"]) == 1
+
+            fleet[1].write_bytes(b"<CHECKLIST/>")
+            result = index.update(fleet[1:], workers=1)
+            assert list(result["errors"]) == result["removed"] == [str(fleet[1])]
+            assert len(index) == 0 and index.query() == []
+
+    def test_query(self, tmp_path, fleet):
+        with FleetIndex(tmp_path / "fleet.db") as index:
+            index.update(fleet, workers=1)
+            rows = index.query(vid="V-257777", status="Open", category="I")
+            assert [(x["host"], x["severity"]) for x in rows] == [("one", "high")]
+            assert rows[0]["stigid"] == "xccdf_mil.disa.stig_benchmark_RHEL_9_STIG"
+            rows = index.query(status="Open", host=["one", "two"])
+            assert sorted((x["host"], x["vid"]) for x in rows) == [
+                ("one", "V-257777"),
+                ("one", "V-258134"),
+                ("two", "V-258134"),
+            ]
+            assert index.counts(("host", "status"), status="Open") == {
+                ("one", "Open"): 2,
+                ("two", "Open"): 1,
+            }
+            assert index.counts("severity", status="Open") == {"high": 1, "medium": 2}
+            with pytest.raises(ValueError):
+                index.query(hostname="one")
+            with pytest.raises(ValueError):
+                index.counts(group_by=("status; DROP TABLE vulns",))
+            with pytest.raises(ValueError):
+                index.query(category="IV")
+            plan = index.connection.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM vulns WHERE severity = ?",
+                ("high",),
+            ).fetchall()
+            assert "vulns_severity_status" in plan[0][-1]
+
+    def test_query_none(self, tmp_path, fleet):
+        with FleetIndex(tmp_path / "fleet.db") as index:
+            index.update(fleet, workers=1)
+            assert index.counts("severity_override") == {None: 832}
+            assert len(index.query(severity_override=None)) == 832
+            assert len(index.query(severity_override=[None, "high"])) == 832
+            assert index.query(severity_override="high") == []
+            assert index.counts("host", severity_override=None, status="Open") == {
+                "one": 2,
+                "two": 1,
+            }
+            table = VulnTable()
+            table.add_files(fleet, workers=1)
+            assert len(table.filter(severity_override=None)) == 832
+            checklist = Checklist(fleet[0])
+            assert len(checklist.query(severity_override=None)) == 416
@@ -1,8 +1,17 @@
+import gzip
 import ipaddress
+import lzma
 import re
 from pathlib import Path
 
-from pigsty.resources.openscap import OpenSCAPSTIGViewerResult, OpenSCAPRuleResult
+from pigsty.resources.openscap import (
+    OpenSCAPRuleRecord,
+    OpenSCAPRuleResult,
+    OpenSCAPSTIGViewerResult,
+    parse_cache_info,
+    parse_time,
+    parse_vid,
+)
 
 
 class TestOpenSCAP:
@@ -52,3 +61,84 @@ class TestOpenSCAP:
         assert all(isinstance(r, OpenSCAPRuleResult) for r in r.rule_results.values())
         for k, v in r.rule_results.items():
             assert k in v.rule_id
+
+    def test_rule_result_value(self):
+        r = OpenSCAPSTIGViewerResult(self.stigviewer)
+        assert r.rule_results["V-257777"].result == "pass"
+        assert r.rule_results["V-257823"].result == "notselected"
+        for result in r.rule_results.values():
+            assert result.result == result.node.findtext(
+                "{http://checklists.nist.gov/xccdf/1.2}result"
+            )
+            assert result.result is not None
+
+    def test_target_info(self):
+        r = OpenSCAPSTIGViewerResult(self.stigviewer)
+        assert r.target == "one"
+        assert r.identity == "vagrant"
+        assert r.target_addresses == {"192.168.124.186"}
+        assert r.ipv4 == {"192.168.124.186"}
+        assert r.ipv6 == set()
+        assert r.mac == {"52:54:00:B0:07:B8"}
+        assert r.hostname == {"one"}
+        assert r.fqdn == {"one"}
+        assert r.cpe == {"cpe:/o:redhat:enterprise_linux:9"}
+        assert "#package_sudo" in r.platform
+        r.set_value.clear()
+        assert r.set_value
+
+    def test_rule_result_as_dict(self):
+        r = OpenSCAPSTIGViewerResult(self.stigviewer)
+        data = r.rule_results["V-257777"].as_dict()
+        assert data["result"] == "pass"
+        assert data["ident"] == {
+            "system": "https://ncp.nist.gov/cce",
+            "text": "CCE-83453-1",
+        }
+        assert data["check"]["check_content_ref"] == {
+            "name": "oval:ssg-installed_OS_is_vendor_supported:def:1",
+            "href": "ssg-rhel9-oval.xml",
+        }
+
+    def test_iter_rule_results(self):
+        loaded = OpenSCAPSTIGViewerResult(self.stigviewer)
+        streamed = OpenSCAPSTIGViewerResult(self.stigviewer, autoload=False)
+        records = {x.vid: x.as_dict() for x in streamed.iter_rule_results()}
+        assert records == {k: v.as_dict() for k, v in loaded.rule_results.items()}
+        assert streamed.root is None
+        assert streamed.hostname == loaded.hostname
+        assert streamed.set_value == loaded.set_value
+
+    def test_compact_load(self):
+        loaded = OpenSCAPSTIGViewerResult(self.stigviewer)
+        compact = OpenSCAPSTIGViewerResult(self.stigviewer, compact=True)
+        assert compact.tree is None and compact.root is None
+        assert compact.summary() == loaded.summary()
+        for vid, record in compact.rule_results.items():
+            assert isinstance(record, OpenSCAPRuleRecord)
+            assert not hasattr(record, "__dict__")
+            assert record.as_dict() == loaded.rule_results[vid].as_dict()
+
+    def test_compressed(self, tmp_path):
+        loaded = OpenSCAPSTIGViewerResult(self.stigviewer)
+        for module, suffix in ((gzip, ".gz"), (lzma, ".xz")):
+            file = tmp_path / f"stigviewer-xccdf.xml{suffix}"
+            with module.open(file, "wb") as fh:
+                fh.write(self.stigviewer.read_bytes())
+            result = OpenSCAPSTIGViewerResult(file)
+            assert result.summary()["rule_results"] == loaded.summary()["rule_results"]
+            streamed = OpenSCAPSTIGViewerResult(file, autoload=False)
+            assert len(list(streamed.iter_rule_results())) == len(loaded.rule_results)
+
+    def test_parse_cache(self):
+        parse_time.cache_clear()
+        parse_vid.cache_clear()
+        r = OpenSCAPSTIGViewerResult(self.stigviewer)
+        times = [x.time for x in r.rule_results.values()]
+        info = parse_cache_info()
+        assert info["time"].misses < len(times)
+        assert info["time"].hits + info["time"].misses == len(times)
+        assert info["vid"].misses == len(r.rule_results)
+        assert r.rule_results["V-257777"].vid == "V-257777"
+        assert parse_cache_info()["vid"].hits == 1
+        assert parse_time("2024-03-11T12:16:51+00:00") is times[0]
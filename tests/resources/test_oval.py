@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+from pigsty.resources.openscap import OpenSCAPSTIGViewerResult
+from pigsty.resources.oval import OVALResults
+
+
+class TestOVALResults:
+    oval_file = Path("./tests/files/oval/oval-results.xml")
+    arf_file = Path("./tests/files/arf/arf-results.xml")
+
+    def test_indexes(self):
+        oval = OVALResults(self.oval_file)
+        assert len(oval.definitions) == 3
+        assert len(oval.tests) == 3
+        assert len(oval.objects) == 3
+        assert list(oval.states) == ["oval:ssg-ste_configure_crypto_policy:ste:1"]
+        assert list(oval.variables) == ["oval:ssg-var_system_crypto_policy:var:1"]
+        assert set(oval.definition_results) == set(oval.definitions)
+        assert set(oval.test_results) == set(oval.tests)
+        assert set(oval.collected_objects) == set(oval.objects)
+        assert set(oval.items) == {"1001", "1002"}
+
+    @pytest.mark.parametrize(
+        "definition_id,result",
+        [
+            ("oval:ssg-installed_OS_is_vendor_supported:def:1", "true"),
+            ("oval:ssg-package_aide_installed:def:1", "false"),
+            ("oval:ssg-missing:def:1", None),
+        ],
+    )
+    def test_result(self, definition_id, result):
+        assert OVALResults(self.oval_file).result(definition_id) == result
+
+    def test_explain(self):
+        oval = OVALResults(self.oval_file)
+        explanation = oval.explain("oval:ssg-configure_crypto_policy:def:1")
+        assert explanation["title"] == "Configure System Cryptography Policy"
+        assert explanation["result"] == "false"
+        criteria = explanation["criteria"]
+        assert (criteria["operator"], criteria["result"]) == ("AND", "false")
+        extend, criterion = criteria["children"]
+        assert extend["result"] == "true"
+        assert extend["definition"]["criteria"]["children"][0]["result"] == "true"
+        test = criterion["test"]
+        assert test["type"] == "textfilecontent54_test"
+        assert test["states"] == [
+            {
+                "id": "oval:ssg-ste_configure_crypto_policy:ste:1",
+                "type": "textfilecontent54_state",
+                "comment": None,
+                "operator": "AND",
+                "entities": [
+                    {
+                        "name": "subexpression",
+                        "value": None,
+                        "operation": "equals",
+                        "var_ref": "oval:ssg-var_system_crypto_policy:var:1",
+                    }
+                ],
+            }
+        ]
+        assert test["tested_variables"] == {
+            "oval:ssg-var_system_crypto_policy:var:1": "FIPS"
+        }
+        assert test["object"]["flag"] == "complete"
+        assert [x["id"] for x in test["object"]["items"]] == ["1002"]
+        assert test["object"]["items"][0]["values"]["subexpression"] == "DEFAULT"
+        assert oval.state("oval:ssg-missing:ste:1")["entities"] == []
+        with pytest.raises(KeyError):
+            oval.explain("oval:ssg-missing:def:1")
+
+    def test_explain_rule(self):
+        oval = OVALResults(self.oval_file)
+        result = OpenSCAPSTIGViewerResult("./tests/files/openscap/stigviewer-xccdf.xml")
+        rule = result.rule_results["V-258134"].as_dict()
+        explanation = oval.explain_rule(rule)
+        assert explanation["id"] == "oval:ssg-package_aide_installed:def:1"
+        test = explanation["criteria"]["children"][0]["test"]
+        assert test["object"] == {
+            "id": "oval:ssg-obj_package_aide_installed:obj:1",
+            "flag": "does not exist",
+            "items": [],
+        }
+        assert oval.explain_rule(result.rule_results["V-257823"].as_dict()) is None
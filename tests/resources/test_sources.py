@@ -0,0 +1,103 @@
+import gzip
+import io
+import mmap
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+from pigsty.resources.checklist import Checklist
+from pigsty.resources.openscap import NS, OpenSCAPSTIGViewerResult
+from pigsty.resources.sources import (
+    StreamSource,
+    open_source,
+    source_name,
+    source_path,
+)
+
+
+class TestSources:
+    checklist_file = Path(
+        "./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+    )
+    openscap_file = Path("./tests/files/openscap/stigviewer-xccdf.xml")
+
+    @pytest.mark.parametrize(
+        "wrap", [bytes, bytearray, memoryview, gzip.compress, io.BytesIO]
+    )
+    def test_checklist(self, wrap):
+        expected = Checklist(self.checklist_file).summary()
+        checklist = Checklist(wrap(self.checklist_file.read_bytes()))
+        summary = checklist.summary()
+        assert summary["stigs"] == expected["stigs"]
+        assert summary["file"] in ("<memory>", "<stream>")
+        checklist.load()
+        assert checklist.summary() == summary
+
+    def test_mmap(self):
+        with open(self.checklist_file, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                checklist = Checklist(mm)
+                assert Checklist.peek(mm)[1] == Checklist.peek(self.checklist_file)[1]
+        assert len(checklist.stigs[0].vuln_nodes) == 416
+
+    def test_file_object(self, tmp_path):
+        with open(self.openscap_file, "rb") as fh:
+            result = OpenSCAPSTIGViewerResult(fh)
+            assert not fh.closed
+            assert result.summary()["file"] == str(self.openscap_file)
+        assert result.hostname == OpenSCAPSTIGViewerResult(self.openscap_file).hostname
+
+        data = b"header" + self.checklist_file.read_bytes()
+        fh = io.BytesIO(data)
+        fh.seek(6)
+        checklist = Checklist(autoload=False, file=self.checklist_file)
+        checklist.load(fh)
+        assert isinstance(checklist.file, StreamSource)
+        checklist.stigs[0].vuln_nodes["V-257777"].status = "Open"
+        output = tmp_path / "checklist.ckl"
+        checklist.save(output, incremental=True)
+        assert output.read_bytes().startswith(b'<?xml version="1.0"')
+        assert Checklist(output).stigs[0].vuln_nodes["V-257777"].status == "Open"
+
+    def test_read_only_object(self):
+        class Reader:
+            def __init__(self, data):
+                self.read = io.BytesIO(data).read
+
+        expected = Checklist(self.checklist_file).summary()
+        checklist = Checklist(Reader(self.checklist_file.read_bytes()))
+        assert checklist.file.start == 0
+        assert checklist.summary()["stigs"] == expected["stigs"]
+        data = gzip.compress(self.openscap_file.read_bytes())
+        result = OpenSCAPSTIGViewerResult(Reader(data))
+        assert result.hostname == OpenSCAPSTIGViewerResult(self.openscap_file).hostname
+
+    def test_reload_openscap(self):
+        tree = ET.parse(self.openscap_file)
+        test_result = tree.find(".//xccdf:rule-result/..", NS)
+        rule_results = test_result.findall("xccdf:rule-result", NS)
+        for result in rule_results[1:]:
+            test_result.remove(result)
+        data = ET.tostring(tree.getroot())
+        for compact in (False, True):
+            result = OpenSCAPSTIGViewerResult(self.openscap_file, compact=compact)
+            assert len(result.rule_results) == len(rule_results)
+            result.load(data)
+            assert len(result.rule_results) == 1
+
+    def test_closed_file_object(self, tmp_path):
+        with open(self.checklist_file, "rb") as fh:
+            checklist = Checklist(fh)
+        checklist.stigs[0].vuln_nodes["V-257777"].status = "Open"
+        output = tmp_path / "checklist.ckl"
+        checklist.save(output, incremental=True)
+        assert Checklist(output).stigs[0].vuln_nodes["V-257777"].status == "Open"
+
+    def test_source_path(self):
+        data = b"<CHECKLIST/>"
+        assert source_path("a.ckl") == Path("a.ckl")
+        assert source_path(data) is data
+        assert source_name(memoryview(data)) == "<memory>"
+        with open_source(memoryview(data)) as fh:
+            assert fh.read(4) == b"<CHE"
+            assert fh.seek(0, io.SEEK_END) == len(data)
@@ -0,0 +1,80 @@
+import bz2
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+from pigsty.resources.table import VulnTable
+
+
+class TestVulnTable:
+    rhel9_file = Path(
+        "./tests/files/checklists/U_RHEL_9_V1R1_STIG_SCAP_1-3_Benchmark.ckl"
+    )
+    bad_file = Path("./tests/files/checklists/bad.ckl")
+
+    @pytest.fixture
+    def table(self, fleet_checklists):
+        table = VulnTable()
+        for checklist in fleet_checklists:
+            table.add_checklist(checklist)
+        return table
+
+    def test_add(self, table):
+        assert len(table) == 832
+        assert table.column("host")[:1] == ["one"] and table.column("host")[-1] == "two"
+        assert set(table.column("target_key")) == {"5551"}
+        assert table._codes["status"].typecode == "B"
+        assert len(table._values["vid"]) == 416
+        assert table._codes["vid"].typecode == "H"
+        with pytest.raises(ValueError):
+            table.column("Rule_Ver")
+
+        files = VulnTable()
+        errors = files.add_files([self.rhel9_file, self.bad_file], workers=1)
+        assert list(errors) == [self.bad_file]
+        assert len(files) == 416
+        assert set(files.column("file")) == {str(self.rhel9_file)}
+
+    def test_filter(self, table):
+        rows = list(table.filter(vid="V-257777", status="Open", category="I").rows())
+        assert [(x["host"], x["severity"]) for x in rows] == [("one", "high")]
+        assert rows[0]["stigid"] == "xccdf_mil.disa.stig_benchmark_RHEL_9_STIG"
+        opened = table.filter(status="Open", host=["one", "two"])
+        assert sorted(zip(opened.column("host"), opened.column("vid"))) == [
+            ("one", "V-257777"),
+            ("one", "V-258134"),
+            ("two", "V-258134"),
+        ]
+        assert len(table.filter(status="Open", host="three")) == 0
+        assert len(table.filter()) == len(table)
+        with pytest.raises(ValueError):
+            table.filter(category="IV")
+
+    def test_counts(self, table):
+        assert table.counts() == {"Not_Reviewed": 828, "Open": 3, "NotAFinding": 1}
+        assert table.counts("host", status="Open") == {"one": 2, "two": 1}
+        assert table.counts(("host", "status"), vid="V-257777") == {
+            ("one", "Open"): 1,
+            ("two", "NotAFinding"): 1,
+        }
+        assert table.counts("severity", category="I") == {"high": 36}
+        with pytest.raises(ValueError):
+            table.counts("Rule_Ver")
+
+    def test_export(self, tmp_path, table):
+        opened = table.filter(status="Open")
+        output = tmp_path / "open.csv"
+        opened.to_csv(output)
+        rows = list(csv.DictReader(io.StringIO(output.read_text())))
+        assert [x["vid"] for x in rows] == ["V-257777", "V-258134", "V-258134"]
+        assert rows[0]["severity_override"] == ""
+        with pytest.raises(FileExistsError):
+            opened.to_csv(output)
+
+        output = tmp_path / "open.jsonl.bz2"
+        opened.to_jsonl(output)
+        rows = [json.loads(x) for x in bz2.decompress(output.read_bytes()).splitlines()]
+        assert rows == list(opened.rows())
+        assert rows[0]["severity_override"] is None